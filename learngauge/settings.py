@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 from decouple import config
@@ -237,3 +238,24 @@ AUTH_USER_MODEL = 'learngaugeapis.User'
 # Firebase Configuration
 FIREBASE_CERTIFICATE = config("FIREBASE_CERTIFICATE", "firebase_cert.json")
 FIREBASE_STORAGE_BUCKET_URL = config("FIREBASE_STORAGE_BUCKET_URL")
+
+# Exam result ingestion
+EXAM_INGESTION_IN_PROCESS = config("EXAM_INGESTION_IN_PROCESS", True, cast=bool)
+EXAM_INGESTION_WORKERS = config("EXAM_INGESTION_WORKERS", 2, cast=int)
+EXAM_INGESTION_SYNC_MAX_BYTES = config("EXAM_INGESTION_SYNC_MAX_BYTES", 2 * 1024 * 1024, cast=int)
+EXAM_PARSE_PROCESSES = config("EXAM_PARSE_PROCESSES", min(3, os.cpu_count() or 1), cast=int)
+EXAM_UPLOAD_MAX_BYTES = config("EXAM_UPLOAD_MAX_BYTES", 100 * 1024 * 1024, cast=int)
+EXAM_UPLOAD_MAX_ROWS = config("EXAM_UPLOAD_MAX_ROWS", 100000, cast=int)
+EXAM_UPLOAD_MAX_COLUMNS = config("EXAM_UPLOAD_MAX_COLUMNS", 2000, cast=int)
+EXAM_UPLOAD_STREAMING_MIN_BYTES = config("EXAM_UPLOAD_STREAMING_MIN_BYTES", 10 * 1024 * 1024, cast=int)
+EXAM_UPLOAD_CHUNK_ROWS = config("EXAM_UPLOAD_CHUNK_ROWS", 5000, cast=int)
+EXAM_FILE_CACHE_TIMEOUT = config("EXAM_FILE_CACHE_TIMEOUT", 60 * 60 * 24 * 7, cast=int)
+EXAM_UPLOAD_PREVIEW_TIMEOUT = config("EXAM_UPLOAD_PREVIEW_TIMEOUT", 60 * 30, cast=int)
+ANSWER_SIMILARITY_MIN_IDENTICAL_WRONG_ANSWERS = config("ANSWER_SIMILARITY_MIN_IDENTICAL_WRONG_ANSWERS", 5, cast=int)
+ANSWER_SIMILARITY_MIN_Z_SCORE = config("ANSWER_SIMILARITY_MIN_Z_SCORE", 5.0, cast=float)
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", 60 * 60, cast=int)
+RESPONSE_CACHE_SOFT_TIMEOUT = config("RESPONSE_CACHE_SOFT_TIMEOUT", 60 * 5, cast=int)
+SINGLE_FLIGHT_LOCK_TIMEOUT = config("SINGLE_FLIGHT_LOCK_TIMEOUT", 30, cast=int)
+SINGLE_FLIGHT_WAIT_TIMEOUT = config("SINGLE_FLIGHT_WAIT_TIMEOUT", 10, cast=int)
+SINGLE_FLIGHT_REFRESH_WORKERS = config("SINGLE_FLIGHT_REFRESH_WORKERS", 2, cast=int)
+LIST_TOTAL_CACHE_TIMEOUT = config("LIST_TOTAL_CACHE_TIMEOUT", 60, cast=int)
@@ -0,0 +1,12 @@
+from enum import Enum
+
+class LetterGrade(Enum):
+    A = "A"
+    B = "B"
+    C = "C"
+    D = "D"
+    F = "F"
+
+    @classmethod
+    def values(cls):
+        return [item.value for item in cls]
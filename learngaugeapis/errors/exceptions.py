@@ -2,4 +2,7 @@ class UnVerifiedException(Exception):
     pass
 
 class InvalidFileContentException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class InvalidCursorException(Exception):
+    pass
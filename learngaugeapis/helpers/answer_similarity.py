@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from learngaugeapis.helpers.exam_grading import NO_ANSWER, AnswerMatrix
+from learngaugeapis.models.answer_similarity import AnswerSimilarityPair, AnswerSimilarityReport
+from learngaugeapis.models.exam_answer_matrix import ExamAnswerMatrix
+
+SIMILARITY_BLOCK_ROWS = 512
+PAIR_BATCH_SIZE = 1000
+
+def find_similar_pairs(answer_matrix: AnswerMatrix, min_identical_wrong_answers, min_z_score, block_rows=SIMILARITY_BLOCK_ROWS):
+    """Flag student pairs that share unusually many identical wrong answers.
+
+    Given that two students both got a question wrong, they pick the same wrong choice with probability
+    s = sum(p_c^2) over the class-wide distribution of wrong choices. Summed over the questions both got
+    wrong, this gives the expected count and variance for the pair under independent answering.
+    """
+    answers = answer_matrix.answers
+    number_of_students, number_of_questions = answers.shape
+    width = len(answer_matrix.choices) + 1
+
+    wrong = answer_matrix.answered & ~answer_matrix.correct & (answer_matrix.answer_key != NO_ANSWER)
+    rows, columns = np.nonzero(wrong)
+
+    # One column per (question, choice): the dot product of two rows counts their identical wrong answers.
+    wrong_choices = np.zeros((number_of_students, number_of_questions * width), dtype=np.float32)
+    wrong_choices[rows, columns * width + answers[rows, columns].astype(np.intp)] = 1
+
+    choice_counts = wrong_choices.sum(axis=0, dtype=np.float64).reshape(number_of_questions, width)
+    wrong_counts = choice_counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        match_probabilities = np.nan_to_num((choice_counts ** 2).sum(axis=1) / wrong_counts ** 2)
+
+    wrong = wrong.astype(np.float32)
+    wrong_t = np.ascontiguousarray(wrong.T)
+    expected_weights = wrong * match_probabilities.astype(np.float32)
+    variance_weights = wrong * (match_probabilities * (1 - match_probabilities)).astype(np.float32)
+    wrong_choices_t = np.ascontiguousarray(wrong_choices.T)
+    pairs = []
+
+    for start in range(0, number_of_students, block_rows):
+        stop = min(start + block_rows, number_of_students)
+        identical = wrong_choices[start:stop] @ wrong_choices_t
+        expected = expected_weights[start:stop] @ wrong_t
+        variance = variance_weights[start:stop] @ wrong_t
+
+        # Zero variance means every shared wrong question has a single wrong choice, so matching is expected, not excess.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_scores = np.where(variance > 0, (identical - expected) / np.sqrt(variance), 0)
+
+        # Only the upper triangle: each pair once, never a student with themselves.
+        flagged = (identical >= min_identical_wrong_answers) & (z_scores >= min_z_score)
+        flagged &= np.arange(number_of_students) > np.arange(start, stop)[:, None]
+        first, second = np.nonzero(flagged)
+
+        if not len(first):
+            continue
+
+        shared = np.einsum("ij,ij->i", wrong[first + start], wrong[second])
+
+        for index, (row, column) in enumerate(zip(first.tolist(), second.tolist())):
+            pairs.append({
+                "student_code_a": answer_matrix.student_codes[row + start],
+                "student_code_b": answer_matrix.student_codes[column],
+                "identical_wrong_answers": int(identical[row, column]),
+                "shared_wrong_answers": int(shared[index]),
+                "expected_identical_wrong_answers": round(float(expected[row, column]), 4),
+                "z_score": round(float(z_scores[row, column]), 4),
+            })
+
+    return sorted(pairs, key=lambda pair: -pair["z_score"])
+
+def analyze_exam_similarity(exam, min_identical_wrong_answers=None, min_z_score=None):
+    """Recompute and store the flagged pairs of an exam, replacing the previous report."""
+    if min_identical_wrong_answers is None:
+        min_identical_wrong_answers = settings.ANSWER_SIMILARITY_MIN_IDENTICAL_WRONG_ANSWERS
+
+    if min_z_score is None:
+        min_z_score = settings.ANSWER_SIMILARITY_MIN_Z_SCORE
+
+    started_at = time.perf_counter()
+    answer_matrix = ExamAnswerMatrix.objects.get(exam=exam).to_answer_matrix()
+    pairs = find_similar_pairs(answer_matrix, min_identical_wrong_answers, min_z_score)
+    number_of_students = len(answer_matrix.student_codes)
+
+    with transaction.atomic():
+        AnswerSimilarityReport.objects.filter(exam=exam).delete()
+        report = AnswerSimilarityReport.objects.create(
+            exam=exam,
+            number_of_students=number_of_students,
+            number_of_compared_pairs=number_of_students * (number_of_students - 1) // 2,
+            number_of_flagged_pairs=len(pairs),
+            min_identical_wrong_answers=min_identical_wrong_answers,
+            min_z_score=min_z_score,
+            duration_ms=round((time.perf_counter() - started_at) * 1000, 1),
+        )
+        AnswerSimilarityPair.objects.bulk_create([AnswerSimilarityPair(report=report, **pair) for pair in pairs], batch_size=PAIR_BATCH_SIZE)
+
+    return report
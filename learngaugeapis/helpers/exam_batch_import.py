@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import zipfile
+import zlib
+
+from django.conf import settings
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_files import validate_exam_result_data
+from learngaugeapis.helpers.exam_grading import grade_student_answers
+from learngaugeapis.helpers.exam_ingestion import create_exam_with_results, get_exam_fields, load_question_bank, parse_files, save_question_bank
+from learngaugeapis.serializers.exam import CreateExamSerializer
+from learngaugeapis.serializers.exam_results import ExamBatchManifestSerializer
+
+MANIFEST_NAME = "manifest.json"
+# Raised while reading a member whose data is truncated or fails its CRC check.
+CORRUPT_MEMBER_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError)
+
+def import_exam_archive(archive):
+    """Import one exam per class from a ZIP holding manifest.json, the shared answer/classification files and one student-answer file per class.
+
+    A shared file left out of the manifest is taken from the course question bank.
+    """
+    try:
+        zip_file = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        raise InvalidFileContentException("File nén không hợp lệ!")
+
+    with zip_file:
+        manifest = _read_manifest(zip_file)
+        report = [
+            {"course_class": entry["course_class"], "student_answer_file": entry["student_answer_file"], "status": "pending", "errors": []}
+            for entry in manifest["classes"]
+        ]
+
+        classes = []
+        for entry, class_report in zip(manifest["classes"], report):
+            serializer = CreateExamSerializer(data={
+                **manifest["exam"],
+                **{field: value for field, value in entry.items() if field != "student_answer_file"},
+            })
+
+            if not serializer.is_valid():
+                _fail(class_report, [f"{field}: {', '.join(map(str, errors))}" for field, errors in serializer.errors.items()])
+                continue
+
+            course = serializer.validated_data["course_class"].course
+            classes.append((entry, class_report, course, serializer.validated_data))
+
+        courses = {course.id: course for _, _, course, _ in classes}
+
+        if len(courses) > 1:
+            raise InvalidFileContentException(f"Các lớp trong file nén không thuộc cùng 1 học phần: {', '.join(course.code for course in courses.values())}")
+
+        if classes:
+            course = classes[0][2]
+
+            if not course.clo_types.filter(is_evaluation=True, deleted_at=None).exists():
+                raise InvalidFileContentException("Vui lòng cài đặt CLO đánh giá cho khóa học trước khi thực hiện thao tác này!")
+
+            shared_files = {kind: manifest[f"{kind}_file"] for kind in ["answer", "classification"] if manifest.get(f"{kind}_file")}
+            shared_data = dict(zip(shared_files.keys(), parse_files(course.code, [_read_member(zip_file, kind, name) for kind, name in shared_files.items()])))
+            answer_data, classification_data = shared_data.get("answer"), shared_data.get("classification")
+            save_question_bank(course, answer_data, classification_data)
+
+            student_uploads = []
+            for entry, class_report, _, _ in classes:
+                try:
+                    student_uploads.append(_read_member(zip_file, "student_answer", entry["student_answer_file"]))
+                except InvalidFileContentException as e:
+                    student_uploads.append(None)
+                    _fail(class_report, [str(e)])
+
+            parsed = iter(parse_files(course.code, [upload for upload in student_uploads if upload is not None], return_exceptions=True))
+
+            for (_, class_report, course, validated_data), upload in zip(classes, student_uploads):
+                if upload is not None:
+                    _import_class(class_report, course, validated_data, answer_data, classification_data, next(parsed))
+
+    return {
+        "total_classes": len(report),
+        "succeeded": sum(class_report["status"] == "succeeded" for class_report in report),
+        "failed": sum(class_report["status"] == "failed" for class_report in report),
+        "classes": report,
+    }
+
+def _import_class(class_report, course, validated_data, answer_data, classification_data, student_answer_data):
+    try:
+        if isinstance(student_answer_data, Exception):
+            raise student_answer_data
+
+        answer_data, classification_data = load_question_bank(course, student_answer_data, answer_data, classification_data)
+        validate_exam_result_data(course.code, answer_data, classification_data, student_answer_data)
+
+        exam_fields = get_exam_fields(validated_data)
+        answer_matrix = grade_student_answers(exam_fields["chapters"], answer_data, classification_data, student_answer_data)
+        exam = create_exam_with_results(exam_fields, student_answer_data, answer_matrix)
+
+        class_report.update(status="succeeded", exam=exam.id, total_students=len(student_answer_data))
+    except InvalidFileContentException as e:
+        _fail(class_report, [str(e)])
+    except Exception as e:
+        logging.getLogger().exception("import_exam_archive exc=%s, course_class=%s", str(e), class_report["course_class"])
+        _fail(class_report, ["Lỗi hệ thống!"])
+
+def _fail(class_report, errors):
+    class_report.update(status="failed", errors=errors)
+
+def _read_manifest(zip_file):
+    try:
+        manifest = json.loads(zip_file.read(MANIFEST_NAME))
+    except KeyError:
+        raise InvalidFileContentException(f"Không tìm thấy {MANIFEST_NAME} trong file nén!")
+    except CORRUPT_MEMBER_ERRORS:
+        raise InvalidFileContentException(f"File {MANIFEST_NAME} trong file nén bị hỏng!")
+    except ValueError:
+        raise InvalidFileContentException(f"{MANIFEST_NAME} không đúng định dạng JSON!")
+
+    serializer = ExamBatchManifestSerializer(data=manifest)
+
+    if not serializer.is_valid():
+        raise InvalidFileContentException(f"{MANIFEST_NAME} không hợp lệ: {json.dumps(serializer.errors, ensure_ascii=False)}")
+
+    return serializer.validated_data
+
+def _read_member(zip_file, kind, name):
+    try:
+        info = zip_file.getinfo(name)
+    except KeyError:
+        raise InvalidFileContentException(f"Không tìm thấy file {name} trong file nén!")
+
+    # Checked on the declared size so an oversized member is never decompressed.
+    if info.file_size > settings.EXAM_UPLOAD_MAX_BYTES:
+        raise InvalidFileContentException(f"File {name} vượt quá dung lượng cho phép ({settings.EXAM_UPLOAD_MAX_BYTES // (1024 * 1024)} MB)!")
+
+    try:
+        content = zip_file.read(info)
+    except CORRUPT_MEMBER_ERRORS:
+        raise InvalidFileContentException(f"File {name} trong file nén bị hỏng!")
+
+    return (kind, os.path.basename(name), content)
@@ -0,0 +1,193 @@
+from django.core.files.base import ContentFile
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.spreadsheet_readers import iter_spreadsheet, load_spreadsheet
+
+# Imported by the parse worker processes, so this module must stay free of Django models.
+
+ANSWER_FILE_COLUMNS = {'mã': 'question_code', 'đáp án đúng': 'correct_answer'}
+CLASSIFICATION_FILE_COLUMNS = {'mã đề': 'exam_version_code', 'chương': 'chapter'}
+STUDENT_ANSWER_FILE_COLUMNS = {'mssv': 'student_code', 'stt': 'question_number', 'họ tên': 'student_name'}
+
+class UploadLimits:
+    def __init__(self, max_rows=None, max_columns=None, streaming_min_bytes=None, chunk_rows=5000):
+        self.max_rows = max_rows
+        self.max_columns = max_columns
+        self.streaming_min_bytes = streaming_min_bytes
+        self.chunk_rows = chunk_rows
+
+def validate_exam_result_data(course_code, answer_data, classification_data, student_answer_data):
+    # if len(answer_data["questions"]) != len(classification_data):
+    #     raise InvalidFileContentException("Số lượng câu hỏi trong file đáp án và file câu hỏi - chương không khớp!")
+
+    unique_student_question_codes = set()
+
+    for _, student_data in student_answer_data.items():
+        for question_code in student_data['answers'].keys():
+            unique_student_question_codes.add(question_code)
+
+    unknown_question_codes = unique_student_question_codes - set(answer_data["questions"].keys())
+
+    if unknown_question_codes:
+        raise InvalidFileContentException(f"Có các câu hỏi trong file đáp án của sinh viên không tồn tại trong file đáp án: {', '.join(unknown_question_codes)}")
+
+    number_of_questions_per_student = {}
+    for student_id, student_data in student_answer_data.items():
+        number_of_questions_per_student[student_id] = len(student_data['answers'])
+
+    if len(set(number_of_questions_per_student.values())) > 1:
+        submsg = ", ".join([f"{student_id} có {number_of_questions_per_student[student_id]}" for student_id in number_of_questions_per_student.keys()])
+        raise InvalidFileContentException(f"Số lượng câu hỏi trong file đáp án của sinh viên không tương đồng: {submsg}")
+
+
+def load_and_validate_answer_file(course_code, file, limits=None):
+    limits = limits or UploadLimits()
+    df = load_spreadsheet(file, ANSWER_FILE_COLUMNS, limits.max_rows, limits.max_columns)
+
+    question_codes = df['question_code']
+    question_course_codes = question_codes.str[:-8]
+    versions = question_codes.str[-8:-4]
+
+    duplicate_question_codes = question_codes[question_codes.duplicated()].unique().tolist()
+    invalid_question_codes = question_codes[question_course_codes != course_code.lower()].unique().tolist()
+    course_codes = set(question_course_codes.tolist())
+
+    data = {
+        "questions": {
+            question_code: {
+                "correct_answer": correct_answer,
+                "difficulty": difficulty,
+                "no": no,
+                "version": version,
+                "course_code": _course_code,
+            }
+            for question_code, correct_answer, difficulty, no, version, _course_code in zip(
+                question_codes.tolist(),
+                df['correct_answer'].tolist(),
+                question_codes.str[-1].tolist(),
+                question_codes.str[-4:-1].tolist(),
+                versions.tolist(),
+                question_course_codes.tolist(),
+            )
+        },
+        "exams": {
+            version: {"number_of_questions": int(number_of_questions)}
+            for version, number_of_questions in versions.value_counts(sort=False).items()
+        },
+    }
+
+    all_exams_have_same_number_of_questions = len({exam["number_of_questions"] for exam in data["exams"].values()}) <= 1
+
+    # if not all_exams_have_same_number_of_questions:
+    #     raise InvalidFileContentException(f"Các mã đề thi có số lượng câu hỏi không tương đồng!")
+
+    if duplicate_question_codes:
+        raise InvalidFileContentException(f"File đáp án có {len(duplicate_question_codes)} mã câu hỏi bị trùng lặp: {', '.join(duplicate_question_codes)}")
+
+    if invalid_question_codes:
+        raise InvalidFileContentException(f"File đáp án có các câu không thuộc môn học {course_code}: {', '.join(invalid_question_codes)}")
+
+    if len(course_codes) > 1:
+        raise InvalidFileContentException(f"File đáp án có các câu không thuộc cùng 1 môn học: {', '.join(course_codes)}")
+
+    return data
+
+def load_and_validate_classification_file(course_code, file, limits=None):
+    limits = limits or UploadLimits()
+    df = load_spreadsheet(file, CLASSIFICATION_FILE_COLUMNS, limits.max_rows, limits.max_columns)
+
+    duplicated = df['exam_version_code'].duplicated()
+    exam_version_codes = df['exam_version_code'][~duplicated]
+    course_codes = exam_version_codes.str[:-4]
+
+    duplicate_exam_version_codes = df['exam_version_code'][duplicated].unique().tolist()
+    invalid_exam_version_codes = course_codes[course_codes != course_code.lower()].unique().tolist()
+    course_codes = set(course_codes.tolist())
+
+    data = dict(zip(exam_version_codes.tolist(), df['chapter'][~duplicated].tolist()))
+
+    if duplicate_exam_version_codes:
+        raise InvalidFileContentException(f"File câu hỏi - chương có {len(duplicate_exam_version_codes)} mã đề hỏi bị trùng lặp: {', '.join(duplicate_exam_version_codes)}")
+
+    if invalid_exam_version_codes:
+        raise InvalidFileContentException(f"File câu hỏi - chương có các mã đề không thuộc môn học {course_code}: {', '.join(invalid_exam_version_codes)}")
+
+    if len(course_codes) > 1:
+        raise InvalidFileContentException(f"File câu hỏi - chương có các mã đề không thuộc cùng 1 môn học: {', '.join(course_codes)}")
+
+    return data
+
+def load_and_validate_student_answer_file(course_code, file, limits=None):
+    limits = limits or UploadLimits()
+
+    if limits.streaming_min_bytes is not None and file.size >= limits.streaming_min_bytes:
+        chunks = iter_spreadsheet(file, STUDENT_ANSWER_FILE_COLUMNS, limits.chunk_rows, limits.max_rows, limits.max_columns)
+    else:
+        chunks = [load_spreadsheet(file, STUDENT_ANSWER_FILE_COLUMNS, limits.max_rows, limits.max_columns)]
+
+    data = {}
+    course_codes = set()
+
+    for index, df in enumerate(chunks):
+        if index == 0:
+            _validate_student_answer_columns(df.columns)
+
+        student_codes = df['student_code'].astype(object).where(df['student_code'].notna(), None).map(str).str.strip()
+        student_names = df['student_name'].astype(object).where(df['student_name'].notna(), None).tolist()
+
+        answer_frame = df.drop(columns=['student_code', 'question_number', 'student_name'])
+        question_codes = answer_frame.columns.to_numpy(dtype=object)
+        answers = answer_frame.to_numpy(dtype=object)
+        answered = answer_frame.notna().to_numpy()
+
+        answered_question_codes = answer_frame.columns[answered.any(axis=0)]
+        chunk_course_codes = answered_question_codes.str[:-8]
+
+        student_ids = list(dict.fromkeys(
+            student_id
+            for student_id, duplicated in zip(student_codes.tolist(), student_codes.duplicated().tolist())
+            if duplicated or student_id in data
+        ))
+        invalid_question_codes = answered_question_codes[chunk_course_codes != course_code.lower()].tolist()
+        course_codes.update(chunk_course_codes.tolist())
+
+        for row, student_id in enumerate(student_codes.tolist()):
+            mask = answered[row]
+            student_answers = dict(zip(question_codes[mask].tolist(), answers[row, mask].tolist()))
+
+            data[student_id] = {
+                "student_name": student_names[row],
+                "answers": student_answers,
+                "number_of_questions": len(student_answers),
+            }
+
+        if student_ids:
+            raise InvalidFileContentException(f"Có {len(student_ids)} mã sinh viên bị trùng lặp: {', '.join(student_ids)}")
+
+        if invalid_question_codes:
+            raise InvalidFileContentException(f"File đáp án của sinh viên có các câu không thuộc môn học {course_code}: {', '.join(invalid_question_codes)}")
+
+    if len(course_codes) > 1:
+        raise InvalidFileContentException(f"File đáp án của sinh viên có các câu không thuộc cùng 1 môn học: {', '.join(course_codes)}")
+
+    return data
+
+def _validate_student_answer_columns(columns):
+    duplicate_question_codes = columns[columns.duplicated()].unique().tolist()
+
+    if duplicate_question_codes:
+        raise InvalidFileContentException(f"File đáp án của sinh viên có {len(duplicate_question_codes)} mã câu hỏi bị trùng lặp: {', '.join(duplicate_question_codes)}")
+
+    missing_columns = [column for column, field in STUDENT_ANSWER_FILE_COLUMNS.items() if field not in columns]
+
+    if missing_columns:
+        raise InvalidFileContentException(f"File đáp án của sinh viên thiếu các cột: {', '.join(missing_columns)}")
+
+FILE_VALIDATORS = {
+    "answer": load_and_validate_answer_file,
+    "classification": load_and_validate_classification_file,
+    "student_answer": load_and_validate_student_answer_file,
+}
+
+def parse_exam_file(kind, course_code, file_name, content, limits=None):
+    return FILE_VALIDATORS[kind](course_code, ContentFile(content, name=file_name), limits)
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+
+DIFFICULTIES = ("d", "t", "k")
+
+DIFFICULTY_FIELDS = {
+    "d": ("number_of_easy_questions", "number_of_correct_easy_questions"),
+    "t": ("number_of_medium_questions", "number_of_correct_medium_questions"),
+    "k": ("number_of_hard_questions", "number_of_correct_hard_questions"),
+}
+
+NO_ANSWER = 0
+
+def _to_python_scalar(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if isinstance(value, float) and value != value:
+        return None
+
+    return value
+
+class AnswerMatrix:
+    """Students x questions matrix of encoded choices, 0 meaning the question was not answered."""
+
+    def __init__(self, student_codes, question_codes, choices, answers, answer_key, difficulties, question_chapters):
+        self.student_codes = student_codes
+        self.question_codes = question_codes
+        self.choices = choices
+        self.answers = answers
+        self.answer_key = answer_key
+        self.difficulties = difficulties
+        self.question_chapters = question_chapters
+
+    @classmethod
+    def from_parsed_files(cls, answer_data, classification_data, student_answer_data):
+        questions = answer_data["questions"]
+        question_codes = list(questions.keys())
+        question_index = {question_code: index for index, question_code in enumerate(question_codes)}
+
+        lengths, columns, values = [], [], []
+        for student_data in student_answer_data.values():
+            answers = student_data["answers"]
+            lengths.append(len(answers))
+            columns.extend(map(question_index.__getitem__, answers.keys()))
+            values.extend(answers.values())
+
+        number_of_answers = len(values)
+        values.extend(questions[question_code]["correct_answer"] for question_code in question_codes)
+
+        codes, choices = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        dtype = np.min_scalar_type(len(choices))
+        codes = (codes + 1).astype(dtype)
+
+        matrix = np.zeros((len(student_answer_data), len(question_codes)), dtype=dtype)
+        rows = np.repeat(np.arange(len(lengths), dtype=np.intp), lengths)
+        matrix[rows, np.asarray(columns, dtype=np.intp)] = codes[:number_of_answers]
+
+        return cls(
+            student_codes=list(student_answer_data.keys()),
+            question_codes=question_codes,
+            choices=[_to_python_scalar(choice) for choice in choices],
+            answers=matrix,
+            answer_key=codes[number_of_answers:],
+            difficulties=np.asarray([questions[question_code]["difficulty"] for question_code in question_codes], dtype=str),
+            question_chapters=[_to_python_scalar(classification_data.get(question_code[:-4])) for question_code in question_codes],
+        )
+
+    @property
+    def answered(self):
+        return self.answers != NO_ANSWER
+
+    @property
+    def correct(self):
+        return (self.answers == self.answer_key) & self.answered
+
+    def chapter_mask(self, chapters):
+        chapters = set(chapters)
+        return np.fromiter(
+            (question_chapter is not None and question_chapter in chapters for question_chapter in self.question_chapters),
+            dtype=bool,
+            count=len(self.question_chapters),
+        )
+
+    def difficulty_masks(self):
+        return np.stack([self.difficulties == difficulty for difficulty in DIFFICULTIES], axis=1)
+
+def grade_answer_matrix(answer_matrix: AnswerMatrix, chapter_mask):
+    answered = answer_matrix.answered
+    correct = answer_matrix.correct & chapter_mask
+    counted = answered & chapter_mask
+    difficulty_masks = answer_matrix.difficulty_masks().astype(np.int32)
+
+    return {
+        "number_of_correct_questions": correct.sum(axis=1),
+        "number_of_dropped_questions": (answered & ~chapter_mask).sum(axis=1),
+        "totals_by_difficulty": counted.astype(np.int32) @ difficulty_masks,
+        "correct_by_difficulty": correct.astype(np.int32) @ difficulty_masks,
+    }
+
+def grade_by_chapter(answer_matrix: AnswerMatrix):
+    """Answered and correct counts per student for every chapter in the exam, whether or not it is counted."""
+    chapters = list(dict.fromkeys(chapter for chapter in answer_matrix.question_chapters if chapter is not None))
+    chapter_index = {chapter: index for index, chapter in enumerate(chapters)}
+    chapter_masks = np.zeros((len(answer_matrix.question_codes), len(chapters)), dtype=np.int32)
+
+    for question_index, chapter in enumerate(answer_matrix.question_chapters):
+        if chapter is not None:
+            chapter_masks[question_index, chapter_index[chapter]] = 1
+
+    return {
+        "chapters": chapters,
+        "totals_by_chapter": answer_matrix.answered.astype(np.int32) @ chapter_masks,
+        "correct_by_chapter": answer_matrix.correct.astype(np.int32) @ chapter_masks,
+    }
+
+def student_versions(answer_matrix: AnswerMatrix):
+    """Exam version each student sat, i.e. the one most of their answers belong to; None for a blank row."""
+    versions = [question_code[-8:-4] for question_code in answer_matrix.question_codes]
+    version_codes, version_index = np.unique(versions, return_inverse=True)
+    answered = answer_matrix.answered
+    answers_per_version = answered.astype(np.int32) @ np.eye(len(version_codes), dtype=np.int32)[version_index]
+    dominant_versions = answers_per_version.argmax(axis=1).tolist() if len(version_codes) else []
+
+    return [
+        str(version_codes[index]) if has_answers else None
+        for index, has_answers in zip(dominant_versions, answered.any(axis=1).tolist())
+    ]
+
+def student_grades(grades):
+    for row in range(len(grades["number_of_correct_questions"])):
+        student_grade = {
+            "number_of_correct_questions": int(grades["number_of_correct_questions"][row]),
+            "number_of_dropped_questions": int(grades["number_of_dropped_questions"][row]),
+        }
+
+        for column, difficulty in enumerate(DIFFICULTIES):
+            total_field, correct_field = DIFFICULTY_FIELDS[difficulty]
+            student_grade[total_field] = int(grades["totals_by_difficulty"][row, column])
+            student_grade[correct_field] = int(grades["correct_by_difficulty"][row, column])
+
+        yield student_grade
+
+def validate_dropped_questions(grades):
+    if len(np.unique(grades["number_of_dropped_questions"])) > 1:
+        raise InvalidFileContentException("Số lượng câu hỏi bị loại trừ của sinh viên không tương đồng!")
+
+def grade_student_answers(chapters, answer_data, classification_data, student_answer_data):
+    answer_matrix = AnswerMatrix.from_parsed_files(answer_data, classification_data, student_answer_data)
+    chapter_mask = answer_matrix.chapter_mask(chapters)
+    grades = grade_answer_matrix(answer_matrix, chapter_mask)
+
+    for student_data, student_grade, exam_version in zip(student_answer_data.values(), student_grades(grades), student_versions(answer_matrix)):
+        student_data.update(student_grade, exam_version=exam_version)
+
+    validate_dropped_questions(grades)
+
+    return answer_matrix
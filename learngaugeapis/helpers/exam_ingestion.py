@@ -0,0 +1,403 @@
+import hashlib
+import logging
+import multiprocessing
+import secrets
+import time
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from learngaugeapis.const.letter_grades import LetterGrade
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_files import UploadLimits, parse_exam_file, validate_exam_result_data
+from learngaugeapis.helpers.exam_grading import grade_student_answers
+from learngaugeapis.helpers.exam_result_loader import load_exam_result_chapters, load_exam_results
+from learngaugeapis.helpers.response_cache import invalidate_tags
+from learngaugeapis.helpers.exam_scoring import letter_grade, score_on_scale_10
+from learngaugeapis.models.course import Course
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_answer_matrix import ExamAnswerMatrix
+from learngaugeapis.models.exam_ingestion_job import ExamIngestionJob, ExamIngestionJobStage, ExamIngestionJobStatus
+from learngaugeapis.models.exam_statistics import ExamStatistics
+from learngaugeapis.models.exam_version import ExamVersion
+from learngaugeapis.models.question import Question
+
+EXAM_FIELDS = ["name", "description", "exam_format", "chapters", "pass_expectation_rate", "clo_pass_threshold", "max_score"]
+CACHED_FILE_KINDS = ["answer", "classification"]
+
+_executor = None
+_parse_pool = None
+
+def get_exam_fields(validated_data):
+    return {
+        "course_class_id": validated_data["course_class"].id,
+        "clo_type_id": validated_data["clo_type"].id,
+        **{field: validated_data[field] for field in EXAM_FIELDS},
+    }
+
+def get_upload_limits():
+    return UploadLimits(
+        max_rows=settings.EXAM_UPLOAD_MAX_ROWS,
+        max_columns=settings.EXAM_UPLOAD_MAX_COLUMNS,
+        streaming_min_bytes=settings.EXAM_UPLOAD_STREAMING_MIN_BYTES,
+        chunk_rows=settings.EXAM_UPLOAD_CHUNK_ROWS,
+    )
+
+def check_upload_sizes(*files):
+    max_bytes = settings.EXAM_UPLOAD_MAX_BYTES
+
+    for file in files:
+        if file.size > max_bytes:
+            raise InvalidFileContentException(f"File {file.name} vượt quá dung lượng cho phép ({max_bytes // (1024 * 1024)} MB)!")
+
+def parse_exam_upload(course, answer_file, classification_file, student_answer_file):
+    """Parse an upload; a missing answer or classification file is taken from the course question bank."""
+    files = {"answer": answer_file, "classification": classification_file, "student_answer": student_answer_file}
+    files = {kind: file for kind, file in files.items() if file is not None}
+    check_upload_sizes(*files.values())
+
+    parsed = dict(zip(files.keys(), parse_files(course.code, [read_upload(kind, file) for kind, file in files.items()])))
+    student_answer_data = parsed["student_answer"]
+    answer_data, classification_data = load_question_bank(course, student_answer_data, parsed.get("answer"), parsed.get("classification"))
+    validate_exam_result_data(course.code, answer_data, classification_data, student_answer_data)
+
+    return answer_data, classification_data, student_answer_data
+
+def load_question_bank(course, student_answer_data, answer_data=None, classification_data=None):
+    """Fill in whichever of answer_data/classification_data is None from the question bank, for the exam versions the students sat."""
+    if answer_data is not None and classification_data is not None:
+        return answer_data, classification_data
+
+    question_codes = set().union(*(student_data["answers"].keys() for student_data in student_answer_data.values()))
+    version_codes = {question_code[:-4] for question_code in question_codes}
+
+    if answer_data is None:
+        answer_data = Question.answer_data_for(course, version_codes)
+
+        if not answer_data["questions"]:
+            raise InvalidFileContentException("Ngân hàng câu hỏi của học phần chưa có đáp án cho các mã đề trong file đáp án của sinh viên, vui lòng tải lên file đáp án!")
+
+    if classification_data is None:
+        classification_data = ExamVersion.classification_data_for(course, version_codes)
+
+        if not classification_data:
+            raise InvalidFileContentException("Ngân hàng câu hỏi của học phần chưa có chương cho các mã đề trong file đáp án của sinh viên, vui lòng tải lên file câu hỏi - chương!")
+
+    return answer_data, classification_data
+
+def save_question_bank(course, answer_data=None, classification_data=None):
+    with transaction.atomic():
+        if answer_data is not None:
+            Question.upsert_answer_data(course, answer_data)
+
+        if classification_data is not None:
+            ExamVersion.upsert_classification_data(course, classification_data)
+
+def read_upload(kind, file):
+    return (kind, file.name, file.read())
+
+def parse_files(course_code, uploads, return_exceptions=False):
+    """Parse (kind, name, content) uploads, reusing cached answer/classification files.
+
+    With return_exceptions, a file that fails is returned as its exception instead of aborting the others.
+    """
+    limits = get_upload_limits()
+    cache_keys = {index: parsed_file_cache_key(kind, course_code, content) for index, (kind, _, content) in enumerate(uploads) if kind in CACHED_FILE_KINDS}
+    parsed_files = _get_cached_parsed_files(cache_keys)
+    pending = [index for index in range(len(uploads)) if index not in parsed_files]
+    pending_uploads = [uploads[index] for index in pending]
+
+    if len(pending_uploads) > 1 and settings.EXAM_PARSE_PROCESSES > 1:
+        try:
+            parsed = _parse_in_pool(course_code, pending_uploads, limits, return_exceptions)
+        except BrokenProcessPool:
+            logging.getLogger().exception("parse_files: parse pool is broken, parsing in process")
+            _reset_parse_pool()
+            parsed = _parse_in_process(course_code, pending_uploads, limits, return_exceptions)
+    else:
+        parsed = _parse_in_process(course_code, pending_uploads, limits, return_exceptions)
+
+    parsed_files.update(zip(pending, parsed))
+    _set_cached_parsed_files({
+        cache_keys[index]: parsed_files[index]
+        for index in pending
+        if index in cache_keys and not isinstance(parsed_files[index], Exception)
+    })
+
+    return [parsed_files[index] for index in range(len(uploads))]
+
+def parsed_file_cache_key(kind, course_code, content):
+    return f"exam_file:{kind}:{course_code.lower()}:{hashlib.sha256(content).hexdigest()}"
+
+def _get_cached_parsed_files(cache_keys):
+    if not cache_keys:
+        return {}
+
+    try:
+        cached = cache.get_many(list(cache_keys.values()))
+    except Exception as e:
+        logging.getLogger().warning("parse_files: cannot read parsed file cache exc=%s", str(e))
+        return {}
+
+    return {index: cached[key] for index, key in cache_keys.items() if key in cached}
+
+def _set_cached_parsed_files(values):
+    if not values:
+        return
+
+    try:
+        cache.set_many(values, settings.EXAM_FILE_CACHE_TIMEOUT)
+    except Exception as e:
+        logging.getLogger().warning("parse_files: cannot write parsed file cache exc=%s", str(e))
+
+def _parse_in_process(course_code, uploads, limits, return_exceptions):
+    parsed = []
+
+    for kind, name, content in uploads:
+        try:
+            parsed.append(parse_exam_file(kind, course_code, name, content, limits))
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            parsed.append(e)
+
+    return parsed
+
+def _parse_in_pool(course_code, uploads, limits, return_exceptions):
+    global _parse_pool
+
+    if _parse_pool is None:
+        # forkserver keeps the workers clear of the server's threads and open database connections.
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=settings.EXAM_PARSE_PROCESSES,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+
+    futures = [_parse_pool.submit(parse_exam_file, kind, course_code, name, content, limits) for kind, name, content in uploads]
+
+    try:
+        # Results are collected in file order so the first reported error is the one a sequential parse would raise.
+        return [_future_result(future, return_exceptions) for future in futures]
+    finally:
+        for future in futures:
+            future.cancel()
+
+def _future_result(future, return_exceptions):
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        if not return_exceptions:
+            raise
+        return e
+
+def _reset_parse_pool():
+    global _parse_pool
+
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+def create_exam_with_results(exam_fields, student_answer_data, answer_matrix, question_bank=None):
+    """Insert an exam and its results; question_bank holds the uploaded answer_data/classification_data to save to the
+    course question bank in the same transaction, so the upload is stored whole or not at all."""
+    with transaction.atomic():
+        exam = Exam.objects.create(**exam_fields)
+
+        load_exam_results(exam, student_answer_data)
+        load_exam_result_chapters(exam, answer_matrix)
+        ExamAnswerMatrix.from_answer_matrix(exam, answer_matrix).save()
+        ExamStatistics.rebuild([exam.id])
+
+        if question_bank:
+            save_question_bank(exam.course_class.course, **question_bank)
+
+        invalidate_tags("exams")
+
+    return exam
+
+def create_upload_preview(exam_fields, max_score, student_answer_data, answer_matrix, question_bank=None):
+    preview_token = secrets.token_urlsafe(32)
+    # The raw answers already live in answer_matrix, so they are left out of the cached state.
+    student_results = {
+        student_code: {key: value for key, value in student_data.items() if key != "answers"}
+        for student_code, student_data in student_answer_data.items()
+    }
+
+    cache.set(
+        upload_preview_cache_key(preview_token),
+        {"exam_fields": exam_fields, "student_answer_data": student_results, "answer_matrix": answer_matrix, "question_bank": question_bank},
+        settings.EXAM_UPLOAD_PREVIEW_TIMEOUT,
+    )
+
+    return {
+        "preview_token": preview_token,
+        "expires_in": settings.EXAM_UPLOAD_PREVIEW_TIMEOUT,
+        **summarize_upload(exam_fields, max_score, student_answer_data, answer_matrix),
+    }
+
+def commit_upload_preview(preview_token):
+    cache_key = upload_preview_cache_key(preview_token)
+    claim_key = f"{cache_key}:commit"
+
+    # Only the request holding the claim may insert the preview, so a token is committed at most once. The preview is
+    # read after claiming and dropped only once the insert commits, so a failed insert leaves it there to retry.
+    if not cache.add(claim_key, True, settings.EXAM_UPLOAD_PREVIEW_TIMEOUT):
+        return None
+
+    try:
+        preview = cache.get(cache_key)
+
+        if preview is None:
+            cache.delete(claim_key)
+            return None
+
+        exam = create_exam_with_results(preview["exam_fields"], preview["student_answer_data"], preview["answer_matrix"], preview["question_bank"])
+        transaction.on_commit(lambda: cache.delete_many([cache_key, claim_key]))
+    except BaseException:
+        cache.delete(claim_key)
+        raise
+
+    return exam
+
+def upload_preview_cache_key(preview_token):
+    return f"exam_upload_preview:{preview_token}"
+
+def summarize_upload(exam_fields, max_score, student_answer_data, answer_matrix):
+    chapter_mask = answer_matrix.chapter_mask(exam_fields["chapters"])
+    versions = [question_code[-8:-4] for question_code in answer_matrix.question_codes]
+    version_codes, questions_per_version = np.unique(versions, return_counts=True)
+    students_per_version = Counter(student_data["exam_version"] for student_data in student_answer_data.values())
+
+    scores = [
+        score_on_scale_10(
+            student_data["number_of_correct_easy_questions"] + student_data["number_of_correct_medium_questions"],
+            student_data["number_of_easy_questions"] + student_data["number_of_medium_questions"],
+            max_score,
+        )
+        for student_data in student_answer_data.values()
+    ]
+    letter_grades = [letter_grade(score) for score in scores]
+    total_passed = sum(score >= exam_fields["clo_pass_threshold"] for score in scores)
+
+    return {
+        "total_students": len(student_answer_data),
+        "total_questions": len(answer_matrix.question_codes),
+        "versions": [
+            {
+                "version": str(version_code),
+                "number_of_questions": int(number_of_questions),
+                "number_of_students": students_per_version[str(version_code)],
+            }
+            for version_code, number_of_questions in zip(version_codes, questions_per_version)
+        ],
+        "dropped_questions": [question_code for question_code, counted in zip(answer_matrix.question_codes, chapter_mask) if not counted],
+        "total_passed": int(total_passed),
+        "mean_score": round(float(np.mean(scores)), 2) if scores else None,
+        "letter_grades": {grade: letter_grades.count(grade) for grade in LetterGrade.values()},
+    }
+
+def create_ingestion_job(exam_fields, answer_file, classification_file, student_answer_file):
+    check_upload_sizes(*(file for file in [answer_file, classification_file, student_answer_file] if file is not None))
+
+    return ExamIngestionJob.objects.create(
+        exam_fields=exam_fields,
+        answer_file=answer_file.read() if answer_file is not None else None,
+        answer_file_name=answer_file.name if answer_file is not None else None,
+        classification_file=classification_file.read() if classification_file is not None else None,
+        classification_file_name=classification_file.name if classification_file is not None else None,
+        student_answer_file=student_answer_file.read(),
+        student_answer_file_name=student_answer_file.name,
+    )
+
+def submit_ingestion_job(job: ExamIngestionJob):
+    global _executor
+
+    if not settings.EXAM_INGESTION_IN_PROCESS:
+        return
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.EXAM_INGESTION_WORKERS, thread_name_prefix="exam-ingestion")
+
+    transaction.on_commit(lambda: _executor.submit(run_ingestion_job, job.id))
+
+def run_ingestion_job(job_id):
+    try:
+        claimed = ExamIngestionJob.objects.filter(id=job_id, status=ExamIngestionJobStatus.QUEUED).update(
+            status=ExamIngestionJobStatus.RUNNING,
+            started_at=timezone.now(),
+        )
+
+        if not claimed:
+            return
+
+        job = ExamIngestionJob.objects.get(id=job_id)
+        timer = _StageTimer()
+
+        try:
+            course = Course.objects.get(classes__id=job.exam_fields["course_class_id"])
+
+            job.update_progress(stage=ExamIngestionJobStage.PARSING)
+            with timer.stage("parse_ms"):
+                answer_data, classification_data, student_answer_data = parse_exam_upload(
+                    course,
+                    _stored_file(job.answer_file, job.answer_file_name),
+                    _stored_file(job.classification_file, job.classification_file_name),
+                    _stored_file(job.student_answer_file, job.student_answer_file_name),
+                )
+
+            job.update_progress(stage=ExamIngestionJobStage.GRADING, total_students=len(student_answer_data))
+            with timer.stage("grade_ms"):
+                answer_matrix = grade_student_answers(job.exam_fields["chapters"], answer_data, classification_data, student_answer_data)
+
+            job.update_progress(stage=ExamIngestionJobStage.INSERTING, graded_students=len(student_answer_data))
+            with timer.stage("insert_ms"):
+                job.exam = create_exam_with_results(job.exam_fields, student_answer_data, answer_matrix, {
+                    "answer_data": answer_data if job.answer_file is not None else None,
+                    "classification_data": classification_data if job.classification_file is not None else None,
+                })
+
+            job.inserted_results = len(student_answer_data)
+            job.status = ExamIngestionJobStatus.SUCCEEDED
+        except Course.DoesNotExist:
+            job.status = ExamIngestionJobStatus.FAILED
+            job.errors = ["Không tìm thấy học phần tương ứng!"]
+        except InvalidFileContentException as e:
+            job.status = ExamIngestionJobStatus.FAILED
+            job.errors = [str(e)]
+        except Exception as e:
+            logging.getLogger().exception("run_ingestion_job exc=%s, job_id=%s", str(e), job_id)
+            job.status = ExamIngestionJobStatus.FAILED
+            job.errors = ["Lỗi hệ thống!"]
+
+        job.timings = timer.timings
+        job.stage = ExamIngestionJobStage.DONE
+        job.finished_at = timezone.now()
+        job.save(update_fields=["exam", "inserted_results", "status", "errors", "timings", "stage", "finished_at", "updated_at"])
+    finally:
+        close_old_connections()
+
+def _stored_file(content, name):
+    return ContentFile(bytes(content), name=name) if content is not None else None
+
+class _StageTimer:
+    def __init__(self):
+        self.timings = {}
+        self._started_at = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started_at) * 1000, 1)
+            self.timings["total_ms"] = round((time.perf_counter() - self._started_at) * 1000, 1)
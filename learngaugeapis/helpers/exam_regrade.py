@@ -0,0 +1,86 @@
+import numpy as np
+from django.db import transaction
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_grading import grade_answer_matrix, student_grades, validate_dropped_questions
+from learngaugeapis.helpers.exam_result_loader import RESULT_COUNT_FIELDS, reload_exam_result_chapters, update_exam_result_counts
+from learngaugeapis.helpers.response_cache import entity_tag, invalidate_tags
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_answer_matrix import ExamAnswerMatrix
+from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.models.exam_statistics import ExamStatistics
+
+def regrade_exam(exam: Exam, chapters=None, answer_key=None):
+    with transaction.atomic():
+        exam = Exam.objects.select_for_update().get(id=exam.id)
+        stored_matrix = ExamAnswerMatrix.objects.select_for_update().get(exam=exam)
+        answer_matrix = stored_matrix.to_answer_matrix()
+
+        if chapters is not None:
+            exam.chapters = chapters
+
+        if answer_key:
+            _amend_answer_key(answer_matrix, answer_key)
+
+        grades = grade_answer_matrix(answer_matrix, answer_matrix.chapter_mask(exam.chapters))
+        validate_dropped_questions(grades)
+
+        number_of_questions = answer_matrix.answered.sum(axis=1)
+        new_counts = {}
+        for row, (student_code, student_grade) in enumerate(zip(answer_matrix.student_codes, student_grades(grades))):
+            student_grade["number_of_questions"] = int(number_of_questions[row])
+            new_counts[student_code] = {field: student_grade[key] for field, key in RESULT_COUNT_FIELDS.items()}
+
+        changed_counts = {}
+        number_of_results = 0
+
+        for exam_result in ExamResult.objects.filter(exam=exam).values("id", "student_code", *RESULT_COUNT_FIELDS.keys()).iterator(chunk_size=2000):
+            number_of_results += 1
+            counts = new_counts.get(exam_result["student_code"])
+
+            if counts is not None and any(exam_result[field] != value for field, value in counts.items()):
+                changed_counts[exam_result["id"]] = counts
+
+        update_exam_result_counts(changed_counts)
+
+        # Chapter counts cover every chapter, so only a new answer key changes them.
+        if answer_key:
+            reload_exam_result_chapters(exam, answer_matrix)
+
+        stored_matrix.choice_labels = answer_matrix.choices
+        stored_matrix.answer_key = answer_matrix.answer_key.tobytes()
+        stored_matrix.correctness = np.packbits(answer_matrix.correct, axis=1).tobytes()
+        stored_matrix.save(update_fields=["choice_labels", "answer_key", "correctness", "updated_at"])
+
+        exam.save(update_fields=["chapters", "updated_at"])
+        ExamStatistics.rebuild([exam.id])
+        invalidate_tags(entity_tag("exam", exam.id))
+
+    return {
+        "total_results": number_of_results,
+        "updated_results": len(changed_counts),
+    }
+
+def _amend_answer_key(answer_matrix, answer_key):
+    question_index = {question_code: index for index, question_code in enumerate(answer_matrix.question_codes)}
+    unknown_question_codes = [question_code for question_code in answer_key if question_code.lower() not in question_index]
+
+    if unknown_question_codes:
+        raise InvalidFileContentException(f"Có các mã câu hỏi không tồn tại trong bài thi: {', '.join(unknown_question_codes)}")
+
+    key = answer_matrix.answer_key.copy()
+    choices = list(answer_matrix.choices)
+    max_choice_code = np.iinfo(key.dtype).max
+
+    for question_code, correct_answer in answer_key.items():
+        correct_answer = correct_answer.lower() if isinstance(correct_answer, str) else correct_answer
+
+        if correct_answer not in choices:
+            if len(choices) == max_choice_code:
+                raise InvalidFileContentException(f"Đáp án {correct_answer} vượt quá số lượng lựa chọn được hỗ trợ!")
+            choices.append(correct_answer)
+
+        key[question_index[question_code.lower()]] = choices.index(correct_answer) + 1
+
+    answer_matrix.answer_key = key
+    answer_matrix.choices = choices
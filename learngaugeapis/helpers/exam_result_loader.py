@@ -0,0 +1,191 @@
+import io
+import json
+
+import numpy as np
+from django.db import connections
+from django.utils import timezone
+
+from learngaugeapis.helpers.exam_grading import grade_by_chapter, student_versions
+from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.models.exam_result_chapter import ExamResultChapter
+
+BULK_CREATE_BATCH_SIZE = 1000
+BULK_UPDATE_BATCH_SIZE = 1000
+
+RESULT_COUNT_FIELDS = {
+    "total_questions": "number_of_questions",
+    "total_easy_questions": "number_of_easy_questions",
+    "total_medium_questions": "number_of_medium_questions",
+    "total_hard_questions": "number_of_hard_questions",
+    "total_correct_easy_questions": "number_of_correct_easy_questions",
+    "total_correct_medium_questions": "number_of_correct_medium_questions",
+    "total_correct_hard_questions": "number_of_correct_hard_questions",
+}
+
+COPY_COLUMNS = ["student_code", "student_name", "exam_id", "exam_version", *RESULT_COUNT_FIELDS.keys(), "created_at", "updated_at"]
+CHAPTER_COPY_COLUMNS = ["exam_id", "exam_result_id", "chapter", "total_questions", "total_correct_questions", "created_at", "updated_at"]
+
+def exam_result_rows(exam, student_answer_data):
+    for student_code, student_data in student_answer_data.items():
+        yield {
+            "student_code": student_code,
+            "student_name": student_data["student_name"],
+            "exam_id": exam.id,
+            "exam_version": student_data.get("exam_version"),
+            **{field: student_data[key] for field, key in RESULT_COUNT_FIELDS.items()},
+        }
+
+def load_exam_results(exam, student_answer_data):
+    """Insert the graded results of an exam; must be called inside the caller's transaction."""
+    return _load_rows(ExamResult, COPY_COLUMNS, exam_result_rows(exam, student_answer_data))
+
+def exam_result_chapter_rows(exam, answer_matrix, result_ids):
+    grades = grade_by_chapter(answer_matrix)
+    chapters = grades["chapters"]
+    totals, corrects = grades["totals_by_chapter"], grades["correct_by_chapter"]
+
+    # Chapters a student has no question in are left out rather than stored as 0/0.
+    for row, column in zip(*(index.tolist() for index in np.nonzero(totals))):
+        yield {
+            "exam_id": exam.id,
+            "exam_result_id": result_ids[answer_matrix.student_codes[row]],
+            "chapter": chapters[column],
+            "total_questions": int(totals[row, column]),
+            "total_correct_questions": int(corrects[row, column]),
+        }
+
+def load_exam_result_chapters(exam, answer_matrix):
+    """Insert the per-chapter counts of an exam's results; must be called inside the caller's transaction, after load_exam_results."""
+    # Fetched up front: the rows are generated while COPY holds the connection.
+    result_ids = dict(ExamResult.objects.filter(exam=exam).values_list("student_code", "id"))
+    return _load_rows(ExamResultChapter, CHAPTER_COPY_COLUMNS, exam_result_chapter_rows(exam, answer_matrix, result_ids))
+
+def reload_exam_result_chapters(exam, answer_matrix):
+    """Replace the per-chapter counts of an exam; must be called inside the caller's transaction."""
+    ExamResultChapter.objects.filter(exam=exam).delete()
+    return load_exam_result_chapters(exam, answer_matrix)
+
+def _load_rows(model, copy_columns, rows):
+    connection = connections[model.objects.db]
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql" and hasattr(cursor.cursor, "copy_expert"):
+            return _copy_rows(cursor, model, copy_columns, rows)
+
+    return _bulk_create_rows(model, rows)
+
+def update_exam_result_counts(changed_counts, batch_size=BULK_UPDATE_BATCH_SIZE):
+    """Write new count fields for {exam_result_id: counts}; must be called inside the caller's transaction."""
+    connection = connections[ExamResult.objects.db]
+    items = list(changed_counts.items())
+    now = timezone.now()
+
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+
+        if connection.vendor == "postgresql":
+            _update_from_values(connection, batch, now)
+        else:
+            exam_results = [ExamResult(id=exam_result_id, updated_at=now, **counts) for exam_result_id, counts in batch]
+            ExamResult.objects.bulk_update(exam_results, [*RESULT_COUNT_FIELDS.keys(), "updated_at"])
+
+    return len(items)
+
+def update_exam_result_versions(exam, answer_matrix, batch_size=BULK_UPDATE_BATCH_SIZE):
+    """Set the version each student sat from the stored answer matrix; used to backfill older exams."""
+    versions = dict(zip(answer_matrix.student_codes, student_versions(answer_matrix)))
+    exam_results = [
+        ExamResult(id=exam_result_id, exam_version=versions.get(student_code))
+        for exam_result_id, student_code in ExamResult.objects.filter(exam=exam).values_list("id", "student_code")
+    ]
+
+    ExamResult.objects.bulk_update(exam_results, ["exam_version"], batch_size=batch_size)
+    return len(exam_results)
+
+def _update_from_values(connection, batch, now):
+    fields = list(RESULT_COUNT_FIELDS.keys())
+    quote_name = connection.ops.quote_name
+    row_placeholder = f"({', '.join(['%s'] * (len(fields) + 1))})"
+    params = [now]
+
+    for exam_result_id, counts in batch:
+        params.append(exam_result_id)
+        params.extend(counts[field] for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {quote_name(ExamResult._meta.db_table)} AS r "
+            f"SET {', '.join(f'{quote_name(field)} = v.{quote_name(field)}' for field in fields)}, updated_at = %s "
+            f"FROM (VALUES {', '.join([row_placeholder] * len(batch))}) AS v(id, {', '.join(quote_name(field) for field in fields)}) "
+            f"WHERE r.id = v.id",
+            params,
+        )
+
+def _copy_rows(cursor, model, copy_columns, rows):
+    now = timezone.now()
+    json_columns = {field.column for field in model._meta.concrete_fields if field.get_internal_type() == "JSONField"}
+    stream = _CsvRowStream(
+        [json.dumps(row[column]) if column in json_columns else row[column] for column in copy_columns[:-2]] + [now, now]
+        for row in rows
+    )
+    cursor.copy_expert(
+        f"COPY {model._meta.db_table} ({', '.join(copy_columns)}) FROM STDIN WITH (FORMAT csv)",
+        stream,
+    )
+    return stream.number_of_rows
+
+def _bulk_create_rows(model, rows):
+    number_of_rows = 0
+    batch = []
+
+    for row in rows:
+        batch.append(model(**row))
+
+        if len(batch) == BULK_CREATE_BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            number_of_rows += len(batch)
+            batch = []
+
+    if batch:
+        model.objects.bulk_create(batch)
+        number_of_rows += len(batch)
+
+    return number_of_rows
+
+def _csv_field(value):
+    # COPY reads an unquoted empty field as NULL and a quoted one as '', so None must be the only value left unquoted
+    # and empty, or nullable columns would get '' where bulk_create stores NULL.
+    if value is None:
+        return ""
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    return '"' + str(value).replace('"', '""') + '"'
+
+class _CsvRowStream(io.RawIOBase):
+    """Read-only file object that encodes rows as CSV on demand, so COPY never sees the whole payload in memory."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._pending = b""
+        self.number_of_rows = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+
+            if row is None:
+                break
+
+            self._pending += (",".join(_csv_field(value) for value in row) + "\n").encode("utf-8")
+            self.number_of_rows += 1
+
+        if size < 0:
+            size = len(self._pending)
+
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
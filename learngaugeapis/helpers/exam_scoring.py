@@ -0,0 +1,36 @@
+from learngaugeapis.const.letter_grades import LetterGrade
+
+LETTER_GRADE_THRESHOLDS = [
+    (8.5, LetterGrade.A.value),
+    (7.0, LetterGrade.B.value),
+    (5.5, LetterGrade.C.value),
+    (4.0, LetterGrade.D.value),
+]
+
+def score_on_scale_10(number_of_correct_questions, number_of_questions, max_score):
+    if max_score == 0 or number_of_questions == 0:
+        return 0.0
+
+    return number_of_correct_questions / number_of_questions * 10
+
+def letter_grade(score):
+    for threshold, grade in LETTER_GRADE_THRESHOLDS:
+        if score >= threshold:
+            return grade
+
+    return LetterGrade.F.value
+
+def exam_result_metrics(exam, exam_result):
+    """Python counterpart of ExamResultQuerySet.with_metrics, for results loaded without its annotations."""
+    max_score = exam.max_score * exam.clo_type.weight / 100
+    number_of_questions = exam_result.total_easy_questions + exam_result.total_medium_questions
+    number_of_correct_questions = exam_result.total_correct_easy_questions + exam_result.total_correct_medium_questions
+    score = score_on_scale_10(number_of_correct_questions, number_of_questions, max_score)
+
+    return {
+        "max_score": max_score,
+        "actual_score": number_of_correct_questions * max_score / number_of_questions if number_of_questions else 0.0,
+        "score_on_scale_10": score,
+        "letter_grade": letter_grade(score),
+        "is_passed": score >= exam.clo_pass_threshold,
+    }
@@ -0,0 +1,42 @@
+from learngaugeapis.const.letter_grades import LetterGrade
+from learngaugeapis.models.exam_result import ExamResult
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+def version_statistics(exam):
+    """Score, grade and difficulty mix per exam version, so versions of unequal difficulty stand out."""
+    rows = ExamResult.objects.filter(exam=exam).statistics_by_version()
+    return [_format_version(row) for row in rows]
+
+def _format_version(row):
+    total_students = row["total_students"]
+
+    return {
+        "version": row["exam_version"],
+        "total_students": total_students,
+        "total_passed": row["total_passed"],
+        "pass_rate": _percentage(row["total_passed"], total_students),
+        "clo_classification": {
+            letter_grade: {
+                "count": row[f"total_grade_{letter_grade}"],
+                "percentage": _percentage(row[f"total_grade_{letter_grade}"], total_students),
+            }
+            for letter_grade in LetterGrade.values()
+        },
+        "score_on_scale_10": {
+            "mean": row["mean_score"],
+            "std_dev": row["std_dev_score"],
+            "min": row["lowest_score"],
+            "max": row["highest_score"],
+        },
+        "difficulties": {
+            difficulty: {
+                "number_of_questions": round(row[f"sum_total_{difficulty}_questions"] / total_students, 2) if total_students else 0,
+                "correct_rate": _percentage(row[f"sum_total_correct_{difficulty}_questions"], row[f"sum_total_{difficulty}_questions"]),
+            }
+            for difficulty in DIFFICULTIES
+        },
+    }
+
+def _percentage(count, total):
+    return count / total * 100 if total else 0
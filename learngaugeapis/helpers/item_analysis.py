@@ -0,0 +1,95 @@
+import math
+import numpy as np
+
+from learngaugeapis.helpers.exam_grading import NO_ANSWER, AnswerMatrix
+
+EXTREME_GROUP_RATIO = 0.27
+
+def analyze_items(answer_matrix: AnswerMatrix, chapters):
+    answers = answer_matrix.answers
+    number_of_students, number_of_questions = answers.shape
+    number_of_choices = len(answer_matrix.choices)
+
+    chapter_mask = answer_matrix.chapter_mask(chapters)
+    answered = answer_matrix.answered
+    correct = answer_matrix.correct.astype(np.float64)
+    total_scores = correct @ chapter_mask.astype(np.float64)
+
+    respondents = answered.sum(axis=0)
+    correct_counts = correct.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_values = correct_counts / respondents
+        point_biserials = _point_biserial(correct, total_scores, chapter_mask)
+
+    discrimination_indexes = _extreme_group_discrimination(correct, total_scores)
+
+    option_counts = np.bincount(
+        (answers.astype(np.intp) + np.arange(number_of_questions, dtype=np.intp) * (number_of_choices + 1)).ravel(),
+        minlength=number_of_questions * (number_of_choices + 1),
+    ).reshape(number_of_questions, number_of_choices + 1)
+
+    items = []
+    for index, question_code in enumerate(answer_matrix.question_codes):
+        answer_key = int(answer_matrix.answer_key[index])
+        items.append({
+            "question_code": question_code,
+            "version": question_code[-8:-4],
+            "no": question_code[-4:-1],
+            "difficulty": str(answer_matrix.difficulties[index]),
+            "chapter": answer_matrix.question_chapters[index],
+            "is_dropped": not bool(chapter_mask[index]),
+            "correct_answer": answer_matrix.choices[answer_key - 1] if answer_key != NO_ANSWER else None,
+            "respondents": int(respondents[index]),
+            "p_value": _to_float(p_values[index]),
+            "point_biserial": _to_float(point_biserials[index]),
+            "discrimination_index": _to_float(discrimination_indexes[index]),
+            "no_answer": int(option_counts[index, NO_ANSWER]),
+            "options": {
+                str(choice): int(option_counts[index, choice_index + 1])
+                for choice_index, choice in enumerate(answer_matrix.choices)
+                if option_counts[index, choice_index + 1]
+            },
+        })
+
+    return {
+        "number_of_students": number_of_students,
+        "number_of_questions": number_of_questions,
+        "items": items,
+    }
+
+def _point_biserial(correct, total_scores, chapter_mask):
+    # Corrected item-total correlation: each item is correlated with the score on the other counted items.
+    number_of_students = correct.shape[0]
+    p = correct.mean(axis=0)
+    item_total = (correct.T @ total_scores) / number_of_students
+    counted = chapter_mask.astype(np.float64)
+
+    mean_total = total_scores.mean()
+    mean_total_squared = (total_scores ** 2).mean()
+
+    mean_rest = mean_total - p * counted
+    mean_item_rest = item_total - p * counted
+    mean_rest_squared = mean_total_squared - 2 * item_total * counted + p * counted
+
+    covariance = mean_item_rest - p * mean_rest
+    variance_item = p * (1 - p)
+    variance_rest = mean_rest_squared - mean_rest ** 2
+
+    return covariance / np.sqrt(variance_item * variance_rest)
+
+def _extreme_group_discrimination(correct, total_scores):
+    number_of_students = correct.shape[0]
+    group_size = math.ceil(number_of_students * EXTREME_GROUP_RATIO)
+
+    if group_size == 0:
+        return np.full(correct.shape[1], np.nan)
+
+    order = np.argsort(total_scores, kind="stable")
+    lower = correct[order[:group_size]].mean(axis=0)
+    upper = correct[order[-group_size:]].mean(axis=0)
+
+    return upper - lower
+
+def _to_float(value):
+    return None if not np.isfinite(value) else round(float(value), 4)
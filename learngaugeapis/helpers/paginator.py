@@ -1,5 +1,19 @@
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+from functools import reduce
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
 from rest_framework.pagination import PageNumberPagination
 
+from learngaugeapis.errors.exceptions import InvalidCursorException
+
 class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = "size"
     max_page_size = 50
@@ -10,4 +24,143 @@ class CustomPageNumberPagination(PageNumberPagination):
             'total_page': self.page.paginator.num_pages,
             'current_page': self.page.number,
             'results': data
-        }
\ No newline at end of file
+        }
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder cuts datetimes to milliseconds, which would make a created_at cursor skip rows.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+class KeysetPagination:
+    """Seek pagination over an ordering that ends with a unique field, so deep pages cost the same as the first.
+
+    ordering is a list of (field, descending) pairs; the cursor is the opaque encoding of the last row's values.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "size"
+    max_page_size = 200
+    page_size = 50
+
+    def paginate_queryset(self, queryset, request, ordering):
+        self.ordering = ordering
+        size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+
+        if cursor:
+            queryset = queryset.filter(self.__after(self.decode_cursor(cursor, queryset)))
+
+        queryset = queryset.order_by(*[f"-{field}" if descending else field for field, descending in ordering])
+        rows = list(queryset[:size + 1])
+
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+
+        return min(max(size, 1), self.max_page_size)
+
+    def get_next_cursor(self):
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        return self.encode_cursor([getattr(last, field) for field, _ in self.ordering])
+
+    def get_paginated_data(self, data):
+        return {
+            'next_cursor': self.get_next_cursor(),
+            'results': data
+        }
+
+    def encode_cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values, cls=CursorJSONEncoder).encode()).decode()
+
+    def decode_cursor(self, cursor, queryset):
+        """The cursor's values, converted by the queryset's field for each ordering entry; raises InvalidCursorException
+        for anything that does not decode to one valid value per entry, since the cursor comes from the client."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise InvalidCursorException("Cursor không hợp lệ!")
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursorException("Cursor không hợp lệ!")
+
+        try:
+            return [self.__to_python(queryset, field, value) for (field, _), value in zip(self.ordering, values)]
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursorException("Cursor không hợp lệ!")
+
+    def __to_python(self, queryset, field, value):
+        # None, bool and nested values are never encoded by get_next_cursor, and to_python would let some of them through.
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise ValueError(f"invalid cursor value for {field}")
+
+        output_field = queryset.query.resolve_ref(field).output_field
+        value = output_field.to_python(value)
+
+        if value is None:
+            raise ValueError(f"invalid cursor value for {field}")
+
+        # Includes the database's integer range, which would otherwise fail in the query.
+        output_field.run_validators(value)
+        return value
+
+    def __after(self, values):
+        # (a, b) > (x, y) expanded as a > x OR (a = x AND b > y), honouring each field's direction.
+        conditions = []
+
+        for index, (field, descending) in enumerate(self.ordering):
+            equal = {prefix_field: value for (prefix_field, _), value in zip(self.ordering[:index], values)}
+            conditions.append(Q(**equal, **{f"{field}__{'lt' if descending else 'gt'}": values[index]}))
+
+        return reduce(lambda left, right: left | right, conditions)
+
+class CreatedAtCursorPagination(KeysetPagination):
+    """Newest-first keyset pagination on (created_at, id) for the list endpoints, used when the request has ?cursor=.
+
+    The total is left out unless ?total=true, and is then counted once per filter and cached for LIST_TOTAL_CACHE_TIMEOUT.
+    """
+    ordering = [("created_at", True), ("id", True)]
+    total_query_param = "total"
+
+    def paginate_queryset(self, queryset, request, ordering=None):
+        with_total = request.query_params.get(self.total_query_param, "").lower() in ("1", "true")
+        self.total = self.get_total(queryset) if with_total else None
+        return super().paginate_queryset(queryset, request, ordering or self.ordering)
+
+    def get_total(self, queryset):
+        key = f"list_total:{queryset.model._meta.db_table}:{hashlib.sha1(str(queryset.order_by().query).encode()).hexdigest()}"
+        total = cache.get(key)
+
+        if total is None:
+            total = queryset.count()
+            cache.set(key, total, settings.LIST_TOTAL_CACHE_TIMEOUT)
+
+        return total
+
+    def get_paginated_data(self, data):
+        paginated_data = super().get_paginated_data(data)
+
+        if self.total is not None:
+            paginated_data['total'] = self.total
+
+        return paginated_data
+
+def get_list_paginator(request, page_number_pagination_class):
+    """Cursor pagination when the request asks for it (an empty ?cursor= is the first page), else the page-number one.
+
+    A new paginator per call: paginate_queryset keeps the page on it, and a cached response may be rebuilt on a
+    background thread while other requests are paginating.
+    """
+    if CreatedAtCursorPagination.cursor_query_param in request.query_params:
+        return CreatedAtCursorPagination()
+
+    return page_number_pagination_class()
@@ -28,4 +28,5 @@ class RestResponse():
             400: "Yêu cầu thất bại!",
             200: "Thành công!",
             201: "Thành công!",
+            202: "Yêu cầu đã được tiếp nhận!",
         }.get(self.__status, "")
\ No newline at end of file
@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from learngaugeapis.helpers.response import RestResponse
+from learngaugeapis.helpers.single_flight import refresh_in_background, single_flight as run_single_flight
+
+CACHED_COLLECTIONS = []
+COUNTERS = ["hits", "stale", "misses", "computes"]
+
+def entity_tag(entity, id):
+    return f"{entity}:{id}"
+
+def add_response_tags(request, *tags):
+    """Record the entities a cached action read, so a write to any of them drops the response."""
+    tags_ = getattr(request, "response_cache_tags", None)
+
+    if tags_ is not None:
+        tags_.update(tags)
+
+def invalidate_tags(*tags):
+    """Drop every cached response carrying one of the tags, once the current transaction commits."""
+    tag_keys = [_tag_key(tag) for tag in tags]
+
+    if tag_keys:
+        transaction.on_commit(lambda: cache.set_many({tag_key: time.time() for tag_key in tag_keys}, None))
+
+def cache_response(collection, single_flight=False):
+    """Cache the 200 responses of a list/retrieve action per query params and caller role.
+
+    List entries are tagged with the collection, and every entry with whatever the action passes to add_response_tags.
+    A tag stores when it was last invalidated, which is after the write committed; an entry is fresh only if the request
+    that built it started no earlier than that for every tag, so invalidation never scans keys and a write landing
+    mid-request never leaves a stale hit.
+
+    With single_flight, concurrent misses on a key are computed once (see helpers/single_flight.py), and an entry older
+    than RESPONSE_CACHE_SOFT_TIMEOUT is still served while one worker rebuilds it in the background, until
+    RESPONSE_CACHE_TIMEOUT drops it. An invalidated entry is never served stale.
+    """
+    if collection not in CACHED_COLLECTIONS:
+        CACHED_COLLECTIONS.append(collection)
+
+    def decorator(method):
+        def compute(view, request, key, args, kwargs):
+            _count(collection, "computes")
+            started_at = time.time()
+            # Only lists change when an entity is created.
+            request.response_cache_tags = {collection} if view.action == "list" else set()
+            response = method(view, request, *args, **kwargs)
+
+            if response.status_code == status.HTTP_200_OK:
+                tag_keys = [_tag_key(tag) for tag in request.response_cache_tags]
+                _ensure_tags(tag_keys, started_at)
+                cache.set(
+                    key,
+                    {
+                        "started_at": started_at,
+                        "fresh_until": started_at + settings.RESPONSE_CACHE_SOFT_TIMEOUT if single_flight else None,
+                        "tags": tag_keys,
+                        "data": response.data,
+                    },
+                    settings.RESPONSE_CACHE_TIMEOUT,
+                )
+
+            return response
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key = response_cache_key(collection, view.action, request, kwargs.get("pk"))
+            entry = _get(key)
+
+            if entry is not None:
+                _count(collection, "hits")
+
+                if entry.get("fresh_until") is not None and entry["fresh_until"] <= time.time():
+                    _count(collection, "stale")
+                    refresh_in_background(key, lambda: compute(view, request, key, args, kwargs))
+
+                return _response(status.HTTP_200_OK, entry["data"])
+
+            _count(collection, "misses")
+
+            if not single_flight:
+                return compute(view, request, key, args, kwargs)
+
+            status_code, data = run_single_flight(
+                key,
+                lambda: _result(compute(view, request, key, args, kwargs)),
+                lambda: _result_of(_get(key)),
+            )
+            return _response(status_code, data)
+
+        return wrapper
+
+    return decorator
+
+def response_cache_key(collection, action, request, pk=None):
+    params = sorted(
+        (name, sorted(value.strip() for value in values if value.strip()))
+        for name, values in request.query_params.lists()
+    )
+    params = [(name, values) for name, values in params if values]
+    role = getattr(request.user, "role", None) or "anonymous"
+    digest = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()
+
+    return f"response_cache:{collection}:{action}:{pk}:{role}:{digest}"
+
+def response_cache_stats():
+    """Counters per collection: hits (stale ones included), stale hits, misses, and computes, the times the view
+    actually ran; with single_flight, misses above computes are requests that shared another request's result."""
+    counters = cache.get_many([_counter_key(collection, counter) for collection in CACHED_COLLECTIONS for counter in COUNTERS])
+    stats = {}
+
+    for collection in CACHED_COLLECTIONS:
+        stats[collection] = {counter: counters.get(_counter_key(collection, counter), 0) for counter in COUNTERS}
+        requests = stats[collection]["hits"] + stats[collection]["misses"]
+        stats[collection]["hit_rate"] = stats[collection]["hits"] / requests * 100 if requests else 0
+
+    return stats
+
+def reset_response_cache_stats():
+    cache.delete_many([_counter_key(collection, counter) for collection in CACHED_COLLECTIONS for counter in COUNTERS])
+
+def _get(key):
+    entry = cache.get(key)
+
+    if entry is None:
+        return None
+
+    invalidated_at = cache.get_many(entry["tags"])
+
+    # A missing tag (never stored or evicted) proves nothing, so it counts as a miss.
+    if len(invalidated_at) != len(entry["tags"]) or any(value > entry["started_at"] for value in invalidated_at.values()):
+        return None
+
+    return entry
+
+def _result(response):
+    return response.status_code, response.data
+
+def _result_of(entry):
+    return (status.HTTP_200_OK, entry["data"]) if entry is not None else None
+
+def _response(status_code, data):
+    # Each request gets its own Response: rendering mutates it, and coalesced requests share the data.
+    return Response(data, status=status_code, content_type=RestResponse.content_type)
+
+def _ensure_tags(tag_keys, started_at):
+    # A tag seen for the first time counts as invalidated when this request started: its entry stays fresh while older
+    # entries still carrying a tag that was evicted turn stale.
+    stored = cache.get_many(tag_keys)
+
+    for tag_key in tag_keys:
+        if tag_key not in stored:
+            cache.add(tag_key, started_at, None)
+
+def _count(collection, counter):
+    key = _counter_key(collection, counter)
+
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+    except Exception as e:
+        logging.getLogger().error("response_cache._count exc=%s, key=%s", str(e), key)
+
+def _tag_key(tag):
+    return f"response_cache:tag:{tag}"
+
+def _counter_key(collection, counter):
+    return f"response_cache:stats:{collection}:{counter}"
@@ -0,0 +1,108 @@
+import logging
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+POLL_INTERVAL = 0.05
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+_executor = None
+
+def acquire_lock(key):
+    token = secrets.token_hex(8)
+    return token if cache.add(key, token, settings.SINGLE_FLIGHT_LOCK_TIMEOUT) else None
+
+def release_lock(key, token):
+    # Not atomic, but the lock also expires on its own; this only avoids dropping a lock re-taken after expiry.
+    if cache.get(key) == token:
+        cache.delete(key)
+
+def single_flight(key, compute, poll):
+    """Run compute() once per key across the threads of this process and across workers; the others get its result.
+
+    Threads of this process wait on the leader's future. Only the leader takes the Redis lock; while another worker holds
+    it, the leader polls poll() for that worker's result. Anyone waiting longer than SINGLE_FLIGHT_WAIT_TIMEOUT gives up
+    and computes on its own, so a stuck worker slows requests down instead of failing them.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+
+        if leader:
+            future = _inflight[key] = Future()
+
+    if not leader:
+        try:
+            return future.result(timeout=settings.SINGLE_FLIGHT_WAIT_TIMEOUT)
+        except TimeoutError:
+            return compute()
+
+    try:
+        result = _lead(key, compute, poll)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+def refresh_in_background(key, refresh):
+    """Run refresh() on a background thread unless a worker is already recomputing key; returns whether it started."""
+    global _executor
+
+    lock_key = _lock_key(key)
+    token = acquire_lock(lock_key)
+
+    if token is None:
+        return False
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.SINGLE_FLIGHT_REFRESH_WORKERS, thread_name_prefix="single-flight")
+
+    _executor.submit(_run_refresh, lock_key, token, refresh)
+    return True
+
+def _lead(key, compute, poll):
+    lock_key = _lock_key(key)
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+
+    while True:
+        token = acquire_lock(lock_key)
+
+        if token is not None:
+            try:
+                # The previous holder may have stored its result between our last poll and the lock being freed.
+                result = poll()
+                return result if result is not None else compute()
+            finally:
+                release_lock(lock_key, token)
+
+        result = poll()
+
+        if result is not None:
+            return result
+
+        if time.monotonic() >= deadline:
+            return compute()
+
+        time.sleep(POLL_INTERVAL)
+
+def _run_refresh(lock_key, token, refresh):
+    try:
+        refresh()
+    except Exception as e:
+        logging.getLogger().exception("single_flight._run_refresh exc=%s, key=%s", str(e), lock_key)
+    finally:
+        release_lock(lock_key, token)
+        close_old_connections()
+
+def _lock_key(key):
+    return f"{key}:lock"
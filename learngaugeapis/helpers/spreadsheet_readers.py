@@ -0,0 +1,222 @@
+import os
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+
+XLSX_MAGIC = b"PK\x03\x04"
+
+class SpreadsheetReader:
+    name = None
+    format = None
+    required_module = None
+    streaming = False
+
+    def is_available(self):
+        return self.required_module is None or find_spec(self.required_module) is not None
+
+    def read(self, file) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def read_header(self, file):
+        """The header row as written, leaving the file where it was; pandas' read renames duplicate names to "name.1"."""
+        position = file.tell()
+
+        try:
+            if self.format == "csv":
+                header_row = pd.read_csv(file, engine="c", header=None, nrows=1, dtype=object)
+            else:
+                header_row = pd.read_excel(file, engine=self.name, header=None, nrows=1, dtype=object)
+        except pd.errors.EmptyDataError:
+            header_row = pd.DataFrame()
+        finally:
+            file.seek(position)
+
+        return _header_names(header_row.iloc[0].tolist() if len(header_row) else [])
+
+    def stream(self, file, chunk_rows):
+        """Yield the sheet as DataFrames of at most chunk_rows rows, always at least one, keeping the header row as-is."""
+        raise NotImplementedError
+
+class PyArrowCsvReader(SpreadsheetReader):
+    name = "pyarrow"
+    format = "csv"
+    required_module = "pyarrow"
+
+    def read(self, file):
+        return pd.read_csv(file, engine="pyarrow")
+
+class CCsvReader(SpreadsheetReader):
+    name = "c"
+    format = "csv"
+    streaming = True
+
+    def read(self, file):
+        return pd.read_csv(file, engine="c")
+
+    def stream(self, file, chunk_rows):
+        header = self.read_header(file)
+
+        try:
+            chunks = pd.read_csv(file, engine="c", header=None, skiprows=1, chunksize=chunk_rows)
+        except pd.errors.EmptyDataError:
+            chunks = []
+
+        empty = True
+        for chunk in chunks:
+            chunk.columns = header
+            empty = False
+            yield chunk
+
+        if empty:
+            yield pd.DataFrame(columns=header)
+
+class CalamineXlsxReader(SpreadsheetReader):
+    name = "calamine"
+    format = "xlsx"
+    required_module = "python_calamine"
+
+    def read(self, file):
+        return pd.read_excel(file, engine="calamine")
+
+class OpenpyxlXlsxReader(SpreadsheetReader):
+    name = "openpyxl"
+    format = "xlsx"
+    required_module = "openpyxl"
+    streaming = True
+
+    def read(self, file):
+        return pd.read_excel(file, engine="openpyxl")
+
+    def stream(self, file, chunk_rows):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file, read_only=True, data_only=True)
+
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = _header_names(next(rows, ()))
+            batch = []
+            empty = True
+
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+
+                batch.append(row[:len(header)])
+
+                if len(batch) == chunk_rows:
+                    yield pd.DataFrame(batch, columns=header)
+                    batch = []
+                    empty = False
+
+            if batch or empty:
+                yield pd.DataFrame(batch, columns=header)
+        finally:
+            workbook.close()
+
+READERS = [
+    PyArrowCsvReader(),
+    CCsvReader(),
+    CalamineXlsxReader(),
+    OpenpyxlXlsxReader(),
+]
+
+def detect_format(file):
+    ext = os.path.splitext(getattr(file, "name", None) or "")[1].lower()
+
+    if ext in (".csv", ".xlsx"):
+        return ext[1:]
+
+    position = file.tell()
+    header = file.read(len(XLSX_MAGIC))
+    file.seek(position)
+
+    return "xlsx" if header == XLSX_MAGIC else "csv"
+
+def get_reader(file_format, name=None, streaming=False):
+    for reader in READERS:
+        if reader.format == file_format and (name is None or reader.name == name) and (reader.streaming or not streaming) and reader.is_available():
+            return reader
+
+    raise InvalidFileContentException(f"Không hỗ trợ đọc file định dạng {file_format}!")
+
+def read_spreadsheet(file, reader_name=None):
+    reader = get_reader(detect_format(file), reader_name)
+    # Named as written, like the streamed chunks, so duplicate headers are caught whatever the file size.
+    header = reader.read_header(file)
+    df = reader.read(file)
+
+    if len(header) == len(df.columns):
+        df.columns = header
+
+    return df
+
+def load_spreadsheet(file, columns, max_rows=None, max_columns=None):
+    df = normalize_spreadsheet(read_spreadsheet(file), columns)
+    check_limits(df, max_rows, max_columns)
+    return df
+
+def iter_spreadsheet(file, columns, chunk_rows, max_rows=None, max_columns=None):
+    """Stream the sheet in normalized chunks, aborting as soon as a row or column limit is exceeded."""
+    reader = get_reader(detect_format(file), streaming=True)
+    number_of_rows = 0
+
+    for chunk in reader.stream(file, chunk_rows):
+        chunk = normalize_spreadsheet(chunk, columns)
+        number_of_rows += len(chunk)
+        check_limits(chunk, max_rows, max_columns, number_of_rows)
+        yield chunk
+
+def check_limits(df, max_rows=None, max_columns=None, number_of_rows=None):
+    number_of_rows = len(df) if number_of_rows is None else number_of_rows
+
+    if max_columns is not None and len(df.columns) > max_columns:
+        raise InvalidFileContentException(f"File có {len(df.columns)} cột, vượt quá giới hạn {max_columns} cột!")
+
+    if max_rows is not None and number_of_rows > max_rows:
+        raise InvalidFileContentException(f"File có nhiều hơn {max_rows} dòng dữ liệu!")
+
+def normalize_spreadsheet(df, columns):
+    """Lowercase the headers and string cells, rename the known columns and drop fully blank rows."""
+    df = drop_blank_rows(df)
+    df = df.apply(lowercase_strings)
+    df.columns = df.columns.map(str.lower)
+    return df.rename(columns=columns)
+
+def drop_blank_rows(df):
+    blank = df.isna().all(axis=1)
+
+    if not blank.any():
+        return df
+
+    df = df[~blank].copy()
+
+    # The blank rows made pandas read integer columns as float; whole-number columns go back to int, as without them.
+    for index, dtype in enumerate(df.dtypes):
+        column = df.iloc[:, index]
+
+        if dtype == np.float64 and column.notna().all() and (column == column.round()).all():
+            df.isetitem(index, column.astype(np.int64))
+
+    return df
+
+def lowercase_strings(column: pd.Series) -> pd.Series:
+    inferred_type = pd.api.types.infer_dtype(column, skipna=True)
+
+    if inferred_type == "string":
+        return column.str.lower()
+
+    if not inferred_type.startswith("mixed"):
+        return column
+
+    lowered = column.str.lower()
+    return lowered.where(lowered.notna(), column)
+
+def _header_names(values):
+    return [
+        f"Unnamed: {index}" if value is None or (isinstance(value, float) and value != value) else str(value)
+        for index, value in enumerate(values)
+    ]
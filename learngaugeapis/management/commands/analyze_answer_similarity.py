@@ -0,0 +1,29 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from learngaugeapis.helpers.answer_similarity import analyze_exam_similarity
+from learngaugeapis.models.exam import Exam
+
+class Command(BaseCommand):
+    help = "Flag student pairs with unusually many identical wrong answers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", type=int, action="append", dest="exam_ids", help="Only analyze these exams (repeatable)")
+        parser.add_argument("--min-identical-wrong-answers", type=int, default=None)
+        parser.add_argument("--min-z-score", type=float, default=None)
+
+    def handle(self, *args, **options):
+        exams = Exam.objects.filter(deleted_at=None, answer_matrix__isnull=False).order_by("id")
+
+        if options["exam_ids"]:
+            exams = exams.filter(id__in=options["exam_ids"])
+
+        for exam in exams.iterator():
+            report = analyze_exam_similarity(exam, options["min_identical_wrong_answers"], options["min_z_score"])
+            self.stdout.write(
+                f"exam {exam.id}: {report.number_of_students} students, "
+                f"{report.number_of_flagged_pairs} flagged pairs in {report.duration_ms:.0f} ms"
+            )
+
+        logging.getLogger().info("analyze_answer_similarity done options=%s", options)
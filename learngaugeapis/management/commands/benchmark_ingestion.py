@@ -0,0 +1,270 @@
+import copy
+import io
+import random
+import time
+
+import pandas as pd
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.db import connection, transaction
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_grading import grade_student_answers
+from learngaugeapis.helpers.exam_ingestion import parse_exam_upload
+from learngaugeapis.helpers.exam_result_loader import exam_result_rows, load_exam_results
+from learngaugeapis.helpers.spreadsheet_readers import READERS
+from learngaugeapis.models.academic_program import AcademicProgram
+from learngaugeapis.models.clo_type import CLOType
+from learngaugeapis.models.course import Course
+from learngaugeapis.models.course_class import Class
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.models.major import Major
+from learngaugeapis.models.user import User, UserRole, UserStatus
+
+DIFFICULTIES = ["d", "t", "k"]
+# Keeps parse_files from serving the answer and classification files out of the parsed file cache between runs.
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+CHOICES = ["a", "b", "c", "d"]
+
+def make_synthetic_upload(course_code, students, versions, questions_per_version, chapters=5, seed=0):
+    rng = random.Random(seed)
+    answer_data = {"questions": {}, "exams": {}}
+    classification_data = {}
+
+    for version_no in range(versions):
+        version = f"{version_no:04d}"
+        classification_data[f"{course_code}{version}"] = version_no % chapters + 1
+        answer_data["exams"][version] = {"number_of_questions": questions_per_version}
+
+        for question_no in range(questions_per_version):
+            difficulty = DIFFICULTIES[question_no % len(DIFFICULTIES)]
+            question_code = f"{course_code}{version}{question_no:03d}{difficulty}"
+            answer_data["questions"][question_code] = {
+                "correct_answer": rng.choice(CHOICES),
+                "difficulty": difficulty,
+                "no": f"{question_no:03d}",
+                "version": version,
+                "course_code": course_code,
+            }
+
+    question_codes = list(answer_data["questions"].keys())
+    student_answer_data = {}
+
+    for student_no in range(students):
+        answers = {question_code: rng.choice(CHOICES) for question_code in question_codes}
+        student_answer_data[f"sv{student_no:06d}"] = {
+            "student_name": f"student {student_no}",
+            "answers": answers,
+            "number_of_questions": len(answers),
+        }
+
+    return answer_data, classification_data, student_answer_data
+
+def make_synthetic_files(course_code, students, versions, questions_per_version):
+    answer_data, classification_data, student_answer_data = make_synthetic_upload(course_code, students, versions, questions_per_version)
+
+    answer_frame = pd.DataFrame({
+        "Mã": [question_code.upper() for question_code in answer_data["questions"]],
+        "Đáp án đúng": [question["correct_answer"].upper() for question in answer_data["questions"].values()],
+    })
+    classification_frame = pd.DataFrame({
+        "Mã đề": [chapter_code.upper() for chapter_code in classification_data],
+        "Chương": list(classification_data.values()),
+    })
+    student_answer_frame = pd.DataFrame([
+        {
+            "STT": index + 1,
+            "MSSV": student_code.upper(),
+            "Họ tên": student_data["student_name"],
+            **{question_code.upper(): answer.upper() for question_code, answer in student_data["answers"].items()},
+        }
+        for index, (student_code, student_data) in enumerate(student_answer_data.items())
+    ])
+
+    files = {}
+    for name, frame in [("answer", answer_frame), ("classification", classification_frame), ("student_answer", student_answer_frame)]:
+        xlsx = io.BytesIO()
+        frame.to_excel(xlsx, index=False)
+        files[name] = {"xlsx": xlsx.getvalue(), "csv": frame.to_csv(index=False).encode("utf-8")}
+
+    return files
+
+def legacy_grade_student_answers(chapters, answer_data, classification_data, student_answer_data):
+    for _, student_data in student_answer_data.items():
+        student_data["number_of_correct_easy_questions"] = 0
+        student_data["number_of_correct_medium_questions"] = 0
+        student_data["number_of_correct_hard_questions"] = 0
+        student_data["number_of_correct_questions"] = 0
+        student_data["number_of_easy_questions"] = 0
+        student_data["number_of_medium_questions"] = 0
+        student_data["number_of_hard_questions"] = 0
+        student_data["number_of_dropped_questions"] = 0
+
+        for question_code, answer in student_data['answers'].items():
+            chapter_code = question_code[:-4]
+
+            if chapter_code not in classification_data or classification_data[chapter_code] not in chapters:
+                student_data["number_of_dropped_questions"] += 1
+                continue
+
+            is_correct = answer == answer_data["questions"][question_code]["correct_answer"]
+
+            if is_correct:
+                student_data["number_of_correct_questions"] += 1
+
+            if answer_data["questions"][question_code]["difficulty"] == "d":
+                student_data["number_of_easy_questions"] += 1
+
+                if is_correct:
+                    student_data["number_of_correct_easy_questions"] += 1
+            elif answer_data["questions"][question_code]["difficulty"] == "t":
+                student_data["number_of_medium_questions"] += 1
+
+                if is_correct:
+                    student_data["number_of_correct_medium_questions"] += 1
+            elif answer_data["questions"][question_code]["difficulty"] == "k":
+                student_data["number_of_hard_questions"] += 1
+
+                if is_correct:
+                    student_data["number_of_correct_hard_questions"] += 1
+
+    if len({student_data["number_of_dropped_questions"] for student_data in student_answer_data.values()}) > 1:
+        raise InvalidFileContentException("Số lượng câu hỏi bị loại trừ của sinh viên không tương đồng!")
+
+class Command(BaseCommand):
+    help = "Benchmark the exam result ingestion pipeline on synthetic uploads"
+
+    targets = ["grading", "loader", "readers", "parsing"]
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", choices=self.targets)
+        parser.add_argument("--students", type=int, default=3000)
+        parser.add_argument("--versions", type=int, default=8)
+        parser.add_argument("--questions-per-version", type=int, default=25)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        getattr(self, f"benchmark_{options['target']}")(options)
+
+    def benchmark_grading(self, options):
+        answer_data, classification_data, student_answer_data = make_synthetic_upload(
+            "bench", options["students"], options["versions"], options["questions_per_version"]
+        )
+        chapters = [1, 2, 3, 4]
+
+        self.stdout.write(f"grading {options['students']} students x {len(answer_data['questions'])} questions")
+
+        def run(grader):
+            data = copy.deepcopy(student_answer_data)
+            started_at = time.perf_counter()
+            grader(chapters, answer_data, classification_data, data)
+            return time.perf_counter() - started_at, data
+
+        legacy_timings, legacy_data = zip(*[run(legacy_grade_student_answers) for _ in range(options["repeat"])])
+        vectorized_timings, vectorized_data = zip(*[run(grade_student_answers) for _ in range(options["repeat"])])
+
+        fields = [field for field in legacy_data[0][next(iter(legacy_data[0]))] if field.startswith("number_of_")]
+        for student_code, student_data in legacy_data[0].items():
+            for field in fields:
+                if student_data[field] != vectorized_data[0][student_code][field]:
+                    raise CommandError(f"Mismatch for {student_code}.{field}: {student_data[field]} != {vectorized_data[0][student_code][field]}")
+
+        self.stdout.write(f"{'legacy loop':<24} best={min(legacy_timings) * 1000:10.1f} ms")
+        self.stdout.write(f"{'vectorized':<24} best={min(vectorized_timings) * 1000:10.1f} ms")
+        self.stdout.write(f"speedup x{min(legacy_timings) / min(vectorized_timings):.1f}, counts identical")
+
+    def benchmark_loader(self, options):
+        answer_data, classification_data, student_answer_data = make_synthetic_upload(
+            "bench", options["students"], options["versions"], options["questions_per_version"]
+        )
+        grade_student_answers([1, 2, 3, 4], answer_data, classification_data, student_answer_data)
+
+        def legacy_loader(exam):
+            ExamResult.objects.bulk_create([ExamResult(**row) for row in exam_result_rows(exam, student_answer_data)])
+
+        self.stdout.write(f"inserting {len(student_answer_data)} results on {connection.vendor}")
+
+        with transaction.atomic():
+            exam_fields = self._create_benchmark_exam_fields()
+
+            for label, loader in [("bulk_create", legacy_loader), ("load_exam_results", lambda exam: load_exam_results(exam, student_answer_data))]:
+                timings = []
+
+                for _ in range(options["repeat"]):
+                    exam = Exam.objects.create(**exam_fields)
+                    started_at = time.perf_counter()
+                    loader(exam)
+                    timings.append(time.perf_counter() - started_at)
+
+                    if exam.exam_results.count() != len(student_answer_data):
+                        raise CommandError(f"{label} inserted {exam.exam_results.count()} rows, expected {len(student_answer_data)}")
+
+                best = min(timings)
+                self.stdout.write(f"{label:<24} best={best * 1000:10.1f} ms  {len(student_answer_data) / best:12.0f} rows/s")
+
+            transaction.set_rollback(True)
+
+    def _create_benchmark_exam_fields(self):
+        academic_program = AcademicProgram.objects.create(code="bench", name="bench", description="benchmark")
+        major = Major.objects.create(academic_program=academic_program, code="bench", name="bench", description="benchmark")
+        course = Course.objects.create(major=major, code="bench", name="bench")
+        teacher = User.objects.create(email="benchmark@learngauge.local", status=UserStatus.ACTIVATED, role=UserRole.TEACHER)
+        course_class = Class.objects.create(course=course, teacher=teacher, code="bench", name="bench")
+        clo_type = CLOType.objects.create(course=course, name="bench", description="benchmark", is_evaluation=True, weight=100)
+
+        return {
+            "course_class": course_class,
+            "clo_type": clo_type,
+            "name": "benchmark",
+            "exam_format": "MCQ",
+            "chapters": [1, 2, 3, 4],
+            "pass_expectation_rate": 50,
+            "clo_pass_threshold": 5,
+        }
+
+    def benchmark_readers(self, options):
+        files = make_synthetic_files("bench", options["students"], options["versions"], options["questions_per_version"])
+
+        for name, contents in files.items():
+            self.stdout.write(f"{name} file: xlsx {len(contents['xlsx']) / 1024:.0f} KiB, csv {len(contents['csv']) / 1024:.0f} KiB")
+
+            for reader in READERS:
+                if not reader.is_available():
+                    self.stdout.write(f"  {reader.format:<5} {reader.name:<10} not installed")
+                    continue
+
+                timings = []
+                for _ in range(options["repeat"]):
+                    started_at = time.perf_counter()
+                    reader.read(io.BytesIO(contents[reader.format]))
+                    timings.append(time.perf_counter() - started_at)
+
+                self.stdout.write(f"  {reader.format:<5} {reader.name:<10} best={min(timings) * 1000:10.1f} ms")
+
+    def benchmark_parsing(self, options):
+        files = make_synthetic_files("bench", options["students"], options["versions"], options["questions_per_version"])
+        # All three files are uploaded, so the question bank is never queried and the course needs no row.
+        course = Course(code="bench")
+
+        self.stdout.write("Parsed file cache disabled: every run parses the answer, classification and student answer files.")
+
+        for file_format in ["xlsx", "csv"]:
+            def uploads():
+                return [ContentFile(files[name][file_format], name=f"{name}.{file_format}") for name in ["answer", "classification", "student_answer"]]
+
+            for processes in [1, 3]:
+                with override_settings(EXAM_PARSE_PROCESSES=processes, CACHES=NO_CACHE):
+                    # The first run starts the worker processes, so it is kept out of the timings.
+                    parse_exam_upload(course, *uploads())
+
+                    timings = []
+                    for _ in range(options["repeat"]):
+                        started_at = time.perf_counter()
+                        parse_exam_upload(course, *uploads())
+                        timings.append(time.perf_counter() - started_at)
+
+                mode = "sequential" if processes == 1 else f"{processes} processes"
+                self.stdout.write(f"{file_format:<5} {mode:<12} best={min(timings) * 1000:10.1f} ms")
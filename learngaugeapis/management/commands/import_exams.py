@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_batch_import import MANIFEST_NAME, import_exam_archive
+
+class Command(BaseCommand):
+    help = f"Import the exams of several classes from a ZIP archive described by {MANIFEST_NAME}"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", help="Path to the ZIP archive")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["archive"], "rb") as archive:
+                report = import_exam_archive(archive)
+        except (OSError, InvalidFileContentException) as e:
+            raise CommandError(str(e))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+            return
+
+        for class_report in report["classes"]:
+            if class_report["status"] == "succeeded":
+                self.stdout.write(f"class {class_report['course_class']}: exam {class_report['exam']}, {class_report['total_students']} students")
+            else:
+                self.stderr.write(f"class {class_report['course_class']}: {'; '.join(class_report['errors'])}")
+
+        self.stdout.write(f"{report['succeeded']}/{report['total_classes']} classes imported, {report['failed']} failed")
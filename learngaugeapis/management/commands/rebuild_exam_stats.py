@@ -0,0 +1,58 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.db import close_old_connections, transaction
+from django.core.management.base import BaseCommand
+
+from learngaugeapis.helpers.exam_result_loader import reload_exam_result_chapters, update_exam_result_versions
+from learngaugeapis.helpers.response_cache import entity_tag, invalidate_tags
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_answer_matrix import ExamAnswerMatrix
+from learngaugeapis.models.exam_statistics import ExamStatistics
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized exam statistics table, and optionally the per-chapter counts and exam versions of the results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", type=int, action="append", dest="exam_ids", help="Only rebuild these exams (repeatable)")
+        parser.add_argument("--chunk-size", type=int, default=200)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--chapters", action="store_true", help="Also rebuild the per-chapter counts from the stored answer matrices")
+        parser.add_argument("--versions", action="store_true", help="Also set the exam version of each result from the stored answer matrices")
+
+    def handle(self, *args, **options):
+        exams = Exam.objects.filter(deleted_at=None).order_by("id")
+
+        if options["exam_ids"]:
+            exams = exams.filter(id__in=options["exam_ids"])
+
+        exam_ids = list(exams.values_list("id", flat=True))
+        chunk_size = options["chunk_size"]
+        chunks = [exam_ids[index:index + chunk_size] for index in range(0, len(exam_ids), chunk_size)]
+
+        rebuilt = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = [executor.submit(self._rebuild_chunk, chunk, options["chapters"], options["versions"]) for chunk in chunks]
+
+            for future in as_completed(futures):
+                rebuilt += future.result()
+                self.stdout.write(f"rebuilt {rebuilt}/{len(exam_ids)} exams")
+
+        logging.getLogger().info("rebuild_exam_stats rebuilt=%s", rebuilt)
+
+    def _rebuild_chunk(self, exam_ids, chapters, versions):
+        try:
+            with transaction.atomic():
+                if chapters or versions:
+                    for stored_matrix in ExamAnswerMatrix.objects.filter(exam_id__in=exam_ids).select_related("exam").iterator(chunk_size=20):
+                        answer_matrix = stored_matrix.to_answer_matrix()
+
+                        if chapters:
+                            reload_exam_result_chapters(stored_matrix.exam, answer_matrix)
+                        if versions:
+                            update_exam_result_versions(stored_matrix.exam, answer_matrix)
+
+                invalidate_tags(*(entity_tag("exam", exam_id) for exam_id in exam_ids))
+                return len(ExamStatistics.rebuild(exam_ids))
+        finally:
+            close_old_connections()
@@ -0,0 +1,34 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from learngaugeapis.helpers.exam_ingestion import run_ingestion_job
+from learngaugeapis.models.exam_ingestion_job import ExamIngestionJob, ExamIngestionJobStatus
+
+class Command(BaseCommand):
+    help = "Process queued exam result ingestion jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-interval", type=float, default=2.0)
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+
+    def handle(self, *args, **options):
+        logging.getLogger().info("run_exam_ingestion_worker started options=%s", options)
+
+        while True:
+            job_ids = list(
+                ExamIngestionJob.objects
+                .filter(status=ExamIngestionJobStatus.QUEUED)
+                .order_by("created_at")
+                .values_list("id", flat=True)[:20]
+            )
+
+            for job_id in job_ids:
+                run_ingestion_job(job_id)
+
+            if options["once"]:
+                return
+
+            if not job_ids:
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,34 @@
+from django.db import models
+
+from learngaugeapis.models.exam import Exam
+
+class AnswerSimilarityReport(models.Model):
+    class Meta:
+        db_table = 'answer_similarity_reports'
+
+    id = models.AutoField(primary_key=True)
+    exam = models.OneToOneField(Exam, on_delete=models.CASCADE, related_name='answer_similarity_report')
+    number_of_students = models.IntegerField(default=0)
+    number_of_compared_pairs = models.BigIntegerField(default=0)
+    number_of_flagged_pairs = models.IntegerField(default=0)
+    min_identical_wrong_answers = models.IntegerField()
+    min_z_score = models.FloatField()
+    duration_ms = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class AnswerSimilarityPair(models.Model):
+    class Meta:
+        db_table = 'answer_similarity_pairs'
+        ordering = [models.F('z_score').desc(nulls_first=True), 'id']
+
+    id = models.AutoField(primary_key=True)
+    report = models.ForeignKey(AnswerSimilarityReport, on_delete=models.CASCADE, related_name='pairs')
+    student_code_a = models.CharField(max_length=255)
+    student_code_b = models.CharField(max_length=255)
+    identical_wrong_answers = models.IntegerField(default=0)
+    shared_wrong_answers = models.IntegerField(default=0) # questions both students got wrong, whatever the choice
+    expected_identical_wrong_answers = models.FloatField(default=0)
+    z_score = models.FloatField(null=True, default=None) # None only on reports stored before zero-variance pairs scored 0
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -18,4 +18,7 @@ class Class(models.Model):
     deleted_at = models.DateTimeField(null=True, default=None)
 
     class Meta:
-        db_table = 'classes'
\ No newline at end of file
+        db_table = 'classes'
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
\ No newline at end of file
@@ -21,4 +21,7 @@ class Exam(models.Model):
     deleted_at = models.DateTimeField(null=True, default=None)
 
     class Meta:
-        db_table = 'exams'
\ No newline at end of file
+        db_table = 'exams'
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
\ No newline at end of file
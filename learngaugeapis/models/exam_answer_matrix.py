@@ -0,0 +1,66 @@
+import numpy as np
+from django.db import models
+
+from learngaugeapis.helpers.exam_grading import AnswerMatrix
+from learngaugeapis.models.exam import Exam
+
+class ExamAnswerMatrix(models.Model):
+    class Meta:
+        db_table = 'exam_answer_matrices'
+
+    id = models.AutoField(primary_key=True)
+    exam = models.OneToOneField(Exam, on_delete=models.CASCADE, related_name='answer_matrix')
+    number_of_students = models.IntegerField(default=0)
+    number_of_questions = models.IntegerField(default=0)
+    student_codes = models.JSONField(default=list)
+    question_codes = models.JSONField(default=list)
+    question_chapters = models.JSONField(default=list)
+    choice_labels = models.JSONField(default=list)
+    choices_dtype = models.CharField(max_length=10, default="uint8")
+    choices = models.BinaryField() # number_of_students x number_of_questions, row-major, 0 = no answer
+    correctness = models.BinaryField() # np.packbits of the correct-answer mask, one padded row per student
+    answer_key = models.BinaryField()
+    difficulties = models.BinaryField() # one ASCII byte per question: d, t or k
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def from_answer_matrix(cls, exam, answer_matrix):
+        return cls(
+            exam=exam,
+            number_of_students=len(answer_matrix.student_codes),
+            number_of_questions=len(answer_matrix.question_codes),
+            student_codes=answer_matrix.student_codes,
+            question_codes=answer_matrix.question_codes,
+            question_chapters=answer_matrix.question_chapters,
+            choice_labels=answer_matrix.choices,
+            choices_dtype=answer_matrix.answers.dtype.name,
+            choices=np.ascontiguousarray(answer_matrix.answers).tobytes(),
+            correctness=np.packbits(answer_matrix.correct, axis=1).tobytes(),
+            answer_key=answer_matrix.answer_key.tobytes(),
+            difficulties=answer_matrix.difficulties.astype("S1").tobytes(),
+        )
+
+    def choice_matrix(self):
+        return np.frombuffer(self.choices, dtype=self.choices_dtype).reshape(self.number_of_students, self.number_of_questions)
+
+    def correctness_matrix(self):
+        packed = np.frombuffer(self.correctness, dtype=np.uint8).reshape(self.number_of_students, (self.number_of_questions + 7) // 8)
+        return np.unpackbits(packed, axis=1, count=self.number_of_questions).view(bool)
+
+    def answer_key_vector(self):
+        return np.frombuffer(self.answer_key, dtype=self.choices_dtype)
+
+    def difficulty_vector(self):
+        return np.frombuffer(self.difficulties, dtype="S1")
+
+    def to_answer_matrix(self):
+        return AnswerMatrix(
+            student_codes=self.student_codes,
+            question_codes=self.question_codes,
+            choices=self.choice_labels,
+            answers=self.choice_matrix(),
+            answer_key=self.answer_key_vector(),
+            difficulties=self.difficulty_vector().astype(str),
+            question_chapters=self.question_chapters,
+        )
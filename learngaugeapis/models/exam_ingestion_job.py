@@ -0,0 +1,50 @@
+from django.db import models
+
+from learngaugeapis.models.exam import Exam
+
+class ExamIngestionJobStatus(models.TextChoices):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ExamIngestionJobStage(models.TextChoices):
+    PENDING = "pending"
+    PARSING = "parsing"
+    GRADING = "grading"
+    INSERTING = "inserting"
+    DONE = "done"
+
+class ExamIngestionJob(models.Model):
+    class Meta:
+        db_table = 'exam_ingestion_jobs'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    id = models.AutoField(primary_key=True)
+    status = models.CharField(max_length=20, choices=ExamIngestionJobStatus.choices, default=ExamIngestionJobStatus.QUEUED)
+    stage = models.CharField(max_length=20, choices=ExamIngestionJobStage.choices, default=ExamIngestionJobStage.PENDING)
+    exam_fields = models.JSONField(default=dict)
+    answer_file = models.BinaryField(null=True, default=None) # None when the answers come from the question bank
+    answer_file_name = models.CharField(max_length=255, null=True, default=None)
+    classification_file = models.BinaryField(null=True, default=None)
+    classification_file_name = models.CharField(max_length=255, null=True, default=None)
+    student_answer_file = models.BinaryField()
+    student_answer_file_name = models.CharField(max_length=255)
+    exam = models.ForeignKey(Exam, on_delete=models.SET_NULL, null=True, default=None, related_name='ingestion_jobs')
+    total_students = models.IntegerField(default=0)
+    graded_students = models.IntegerField(default=0)
+    inserted_results = models.IntegerField(default=0)
+    errors = models.JSONField(default=list)
+    timings = models.JSONField(default=dict)
+    started_at = models.DateTimeField(null=True, default=None)
+    finished_at = models.DateTimeField(null=True, default=None)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def update_progress(self, **fields):
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+        self.save(update_fields=[*fields.keys(), "updated_at"])
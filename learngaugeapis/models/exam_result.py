@@ -1,7 +1,11 @@
 from django.db import models
 
+from learngaugeapis.const.letter_grades import LetterGrade
+from learngaugeapis.helpers.exam_scoring import LETTER_GRADE_THRESHOLDS
 from learngaugeapis.models.exam import Exam
 
+METRIC_FIELDS = ["max_score", "actual_score", "score_on_scale_10", "letter_grade", "is_passed"]
+
 class ExamResultQuerySet(models.QuerySet):
     def with_metrics(self):
         from django.db.models import F, Value, FloatField, ExpressionWrapper, Case, When
@@ -27,11 +31,8 @@ class ExamResultQuerySet(models.QuerySet):
             ),
         ).annotate(
             letter_grade=Case(
-                When(score_on_scale_10__gte=8.5, then=Value('A')),
-                When(score_on_scale_10__gte=7.0, then=Value('B')),
-                When(score_on_scale_10__gte=5.5, then=Value('C')),
-                When(score_on_scale_10__gte=4.0, then=Value('D')),
-                default=Value('F')
+                *[When(score_on_scale_10__gte=threshold, then=Value(grade)) for threshold, grade in LETTER_GRADE_THRESHOLDS],
+                default=Value(LetterGrade.F.value)
             ),
             is_passed=Case(
                 When(score_on_scale_10__gte=F('exam__clo_pass_threshold'), then=Value(True)),
@@ -40,10 +41,52 @@ class ExamResultQuerySet(models.QuerySet):
         )
         return qs
 
+    def statistics(self):
+        return self.with_metrics().aggregate(**self.__statistics_aggregates())
+
+    def statistics_by_exam(self):
+        rows = self.with_metrics().order_by().values('exam_id').annotate(**self.__statistics_aggregates())
+        return {row['exam_id']: row for row in rows}
+
+    def statistics_by_version(self):
+        from django.db.models import Sum
+
+        difficulty_aggregates = {
+            f"sum_{field}": Sum(field)
+            for difficulty in ["easy", "medium", "hard"]
+            for field in [f"total_{difficulty}_questions", f"total_correct_{difficulty}_questions"]
+        }
+
+        return list(
+            self.with_metrics().order_by().values('exam_version')
+            .annotate(**self.__statistics_aggregates(), **difficulty_aggregates)
+            .order_by('exam_version')
+        )
+
+    def __statistics_aggregates(self):
+        from django.db.models import Avg, Count, Max, Min, Q, StdDev
+
+        return {
+            "mean_score": Avg('score_on_scale_10'),
+            "std_dev_score": StdDev('score_on_scale_10'),
+            "lowest_score": Min('score_on_scale_10'),
+            "highest_score": Max('score_on_scale_10'),
+            "total_students": Count('id'),
+            "total_passed": Count('id', filter=Q(is_passed=True)),
+            **{
+                f"total_grade_{letter_grade}": Count('id', filter=Q(letter_grade=letter_grade))
+                for letter_grade in LetterGrade.values()
+            },
+        }
+
 
 class ExamResult(models.Model):
     class Meta:
         db_table = 'exam_results'
+        indexes = [
+            models.Index(fields=['exam', 'exam_version']),
+            models.Index(fields=['exam', 'student_code', 'id']),
+        ]
 
     objects = ExamResultQuerySet.as_manager()
 
@@ -51,6 +94,7 @@ class ExamResult(models.Model):
     student_code = models.CharField(max_length=255)
     student_name = models.CharField(max_length=255)
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='exam_results')
+    exam_version = models.CharField(max_length=10, null=True, default=None) # 4-character version segment of the question codes
     total_questions = models.IntegerField(default=0)
     total_easy_questions = models.IntegerField(default=0)
     total_medium_questions = models.IntegerField(default=0)
@@ -0,0 +1,44 @@
+from django.db import models
+from django.db.models import Avg, Count, FloatField, Sum
+from django.db.models.functions import Cast
+
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_result import ExamResult
+
+class ExamResultChapter(models.Model):
+    class Meta:
+        db_table = 'exam_result_chapters'
+
+    id = models.AutoField(primary_key=True)
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='result_chapters') # denormalized so the per-exam aggregate skips exam_results
+    exam_result = models.ForeignKey(ExamResult, on_delete=models.CASCADE, related_name='chapters')
+    chapter = models.JSONField() # same value as in the classification file and Exam.chapters
+    total_questions = models.IntegerField(default=0)
+    total_correct_questions = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def summary_for_exam(cls, exam):
+        rows = cls.objects.filter(exam=exam).order_by().values('chapter').annotate(
+            mean_correct_rate=Avg(Cast('total_correct_questions', FloatField()) / Cast('total_questions', FloatField())),
+            number_of_students=Count('id'),
+            number_of_questions=Sum('total_questions'),
+            number_of_correct_questions=Sum('total_correct_questions'),
+        )
+
+        chapters = [
+            {
+                "chapter": row["chapter"],
+                "is_counted": row["chapter"] in exam.chapters,
+                "total_students": row["number_of_students"],
+                "total_questions": row["number_of_questions"],
+                "total_correct_questions": row["number_of_correct_questions"],
+                "correct_rate": round(row["number_of_correct_questions"] / row["number_of_questions"] * 100, 2),
+                "mean_correct_rate": round(row["mean_correct_rate"] * 100, 2),
+            }
+            for row in rows
+        ]
+
+        # Weakest chapters first.
+        return sorted(chapters, key=lambda chapter: chapter["correct_rate"])
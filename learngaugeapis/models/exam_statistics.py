@@ -0,0 +1,69 @@
+from django.db import models
+
+from learngaugeapis.const.letter_grades import LetterGrade
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_result import ExamResult
+
+class ExamStatistics(models.Model):
+    class Meta:
+        db_table = 'exam_statistics'
+
+    id = models.AutoField(primary_key=True)
+    exam = models.OneToOneField(Exam, on_delete=models.CASCADE, related_name='statistics')
+    total_students = models.IntegerField(default=0)
+    total_passed = models.IntegerField(default=0)
+    pass_rate = models.FloatField(default=0)
+    total_grade_A = models.IntegerField(default=0)
+    total_grade_B = models.IntegerField(default=0)
+    total_grade_C = models.IntegerField(default=0)
+    total_grade_D = models.IntegerField(default=0)
+    total_grade_F = models.IntegerField(default=0)
+    mean_score = models.FloatField(null=True, default=None)
+    std_dev_score = models.FloatField(null=True, default=None)
+    lowest_score = models.FloatField(null=True, default=None)
+    highest_score = models.FloatField(null=True, default=None)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    AGGREGATED_FIELDS = [
+        "total_students",
+        "total_passed",
+        *[f"total_grade_{letter_grade}" for letter_grade in LetterGrade.values()],
+        "mean_score",
+        "std_dev_score",
+        "lowest_score",
+        "highest_score",
+    ]
+
+    @classmethod
+    def rebuild(cls, exam_ids):
+        exam_ids = list(exam_ids)
+        aggregates = ExamResult.objects.filter(exam_id__in=exam_ids).statistics_by_exam()
+        rows = []
+
+        for exam_id in exam_ids:
+            row = cls(exam_id=exam_id, **{field: aggregates[exam_id][field] for field in cls.AGGREGATED_FIELDS} if exam_id in aggregates else {})
+            row.pass_rate = row.total_passed / row.total_students * 100 if row.total_students else 0
+            rows.append(row)
+
+        return cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["exam"],
+            update_fields=[*cls.AGGREGATED_FIELDS, "pass_rate", "updated_at"],
+        )
+
+    @classmethod
+    def for_exams(cls, exam_ids):
+        exam_ids = list(exam_ids)
+        statistics = {row.exam_id: row for row in cls.objects.filter(exam_id__in=exam_ids)}
+        missing_exam_ids = [exam_id for exam_id in exam_ids if exam_id not in statistics]
+
+        if missing_exam_ids:
+            statistics.update({row.exam_id: row for row in cls.rebuild(missing_exam_ids)})
+
+        return statistics
+
+    @classmethod
+    def invalidate(cls, exam_ids):
+        cls.objects.filter(exam_id__in=exam_ids).delete()
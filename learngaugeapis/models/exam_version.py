@@ -0,0 +1,35 @@
+from django.db import models
+
+from learngaugeapis.models.course import Course
+from learngaugeapis.models.question import UPSERT_BATCH_SIZE, json_value
+
+class ExamVersion(models.Model):
+    class Meta:
+        db_table = 'exam_versions'
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'code'], name='exam_versions_course_code_unique'),
+        ]
+
+    id = models.AutoField(primary_key=True)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='exam_versions')
+    code = models.CharField(max_length=255) # <course><version>, lowercase
+    chapter = models.JSONField(null=True, default=None)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def upsert_classification_data(cls, course, classification_data):
+        rows = [cls(course=course, code=code, chapter=json_value(chapter)) for code, chapter in classification_data.items()]
+
+        return cls.objects.bulk_create(
+            rows,
+            batch_size=UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["course", "code"],
+            update_fields=["chapter", "updated_at"],
+        )
+
+    @classmethod
+    def classification_data_for(cls, course, version_codes):
+        """Rebuild the structure returned by load_and_validate_classification_file for the given exam versions."""
+        return dict(cls.objects.filter(course=course, code__in=version_codes).order_by("code").values_list("code", "chapter"))
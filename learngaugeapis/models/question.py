@@ -0,0 +1,76 @@
+import math
+
+from django.db import models
+
+from learngaugeapis.models.course import Course
+
+UPSERT_BATCH_SIZE = 1000
+
+def json_value(value):
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+class Question(models.Model):
+    class Meta:
+        db_table = 'questions'
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'code'], name='questions_course_code_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['course', 'version_code']),
+        ]
+
+    id = models.AutoField(primary_key=True)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='questions')
+    code = models.CharField(max_length=255) # <course><version><no><difficulty>, lowercase
+    version_code = models.CharField(max_length=255) # <course><version>, matches ExamVersion.code
+    version = models.CharField(max_length=10)
+    no = models.CharField(max_length=10)
+    difficulty = models.CharField(max_length=1)
+    correct_answer = models.JSONField(null=True, default=None) # kept as parsed so it compares equal to the student answers
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def upsert_answer_data(cls, course, answer_data):
+        rows = [
+            cls(
+                course=course,
+                code=question_code,
+                version_code=question_code[:-4],
+                version=question["version"],
+                no=question["no"],
+                difficulty=question["difficulty"],
+                correct_answer=json_value(question["correct_answer"]),
+            )
+            for question_code, question in answer_data["questions"].items()
+        ]
+
+        return cls.objects.bulk_create(
+            rows,
+            batch_size=UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["course", "code"],
+            update_fields=["version_code", "version", "no", "difficulty", "correct_answer", "updated_at"],
+        )
+
+    @classmethod
+    def answer_data_for(cls, course, version_codes):
+        """Rebuild the structure returned by load_and_validate_answer_file for the given exam versions."""
+        data = {
+            "questions": {},
+            "exams": {},
+        }
+
+        questions = cls.objects.filter(course=course, version_code__in=version_codes).order_by("code")
+
+        for code, version, no, difficulty, correct_answer in questions.values_list("code", "version", "no", "difficulty", "correct_answer"):
+            data["questions"][code] = {
+                "correct_answer": correct_answer,
+                "difficulty": difficulty,
+                "no": no,
+                "version": version,
+                "course_code": code[:-8],
+            }
+            data["exams"].setdefault(version, {"number_of_questions": 0})["number_of_questions"] += 1
+
+        return data
@@ -21,6 +21,9 @@ class User(AbstractBaseUser):
     class Meta:
         app_label = "learngaugeapis"
         db_table = "users"
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
 
     id = models.AutoField(primary_key=True)
     card_id = models.CharField(max_length=255, unique=True, null=True)
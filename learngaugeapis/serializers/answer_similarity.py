@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from learngaugeapis.models.answer_similarity import AnswerSimilarityPair, AnswerSimilarityReport
+
+class AnswerSimilarityPairSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AnswerSimilarityPair
+        exclude = ['report', 'created_at', 'updated_at']
+
+class AnswerSimilarityReportSerializer(serializers.ModelSerializer):
+    pairs = AnswerSimilarityPairSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = AnswerSimilarityReport
+        fields = '__all__'
+
+class AnalyzeAnswerSimilaritySerializer(serializers.Serializer):
+    min_identical_wrong_answers = serializers.IntegerField(required=False, min_value=1)
+    min_z_score = serializers.FloatField(required=False, min_value=0)
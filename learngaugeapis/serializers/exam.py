@@ -1,8 +1,10 @@
 from rest_framework import serializers
 
 from learngaugeapis.const.exam_formats import ExamFormat
+from learngaugeapis.const.letter_grades import LetterGrade
 from learngaugeapis.models.course_class import Class
 from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_statistics import ExamStatistics
 from learngaugeapis.models.course import Course
 from learngaugeapis.models.clo_type import CLOType
 from learngaugeapis.serializers.exam_result import ExamResultSerializer
@@ -12,16 +14,57 @@ from learngaugeapis.serializers.major import MajorSerializer
 from learngaugeapis.serializers.clo_type import CLOTypeSerializer
 from learngaugeapis.serializers.academic_program import AcademicProgramSerializer
 
+# One select_related chain loads everything get_metadata and side_load_exam_hierarchy touch.
+EXAM_HIERARCHY_RELATED = ["clo_type__course", "course_class__course__major__academic_program"]
+
 class ExamSerializer(serializers.ModelSerializer):
     exam_results = ExamResultSerializer(many=True, read_only=True)
     metadata = serializers.SerializerMethodField()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Nested results are opt-in (?expand=results); /exams/{id}/results serves them paginated.
+        if "results" not in self.context.get("expand", ()):
+            self.fields.pop("exam_results")
+
     class Meta:
         model = Exam
         fields = '__all__'
 
     def get_metadata(self, obj: Exam):
-        total_students = obj.exam_results.count()
+        statistics: ExamStatistics = self.context.get("exam_statistics", {}).get(obj.id) or ExamStatistics.for_exams([obj.id])[obj.id]
+        total_students = statistics.total_students
+
+        return {
+            **self.__hierarchy(obj),
+            "total_students": total_students,
+            "pass_rate": statistics.pass_rate,
+            "clo_classification": {
+                letter_grade: {
+                    "count": getattr(statistics, f"total_grade_{letter_grade}"),
+                    "percentage": self.__percentage(getattr(statistics, f"total_grade_{letter_grade}"), total_students)
+                }
+                for letter_grade in LetterGrade.values()
+            },
+            "score_on_scale_10": {
+                "mean": statistics.mean_score,
+                "std_dev": statistics.std_dev_score,
+                "min": statistics.lowest_score,
+                "max": statistics.highest_score,
+            }
+        }
+
+    def __hierarchy(self, obj: Exam):
+        # With side_load the objects are sent once per page (see side_load_exam_hierarchy) and only referenced by id here.
+        if self.context.get("side_load"):
+            return {
+                "course_class": obj.course_class_id,
+                "course": obj.course_class.course_id,
+                "major": obj.course_class.course.major_id,
+                "clo_type": obj.clo_type_id,
+                "academic_program": obj.course_class.course.major.academic_program_id,
+            }
 
         return {
             "course_class": ClassSerializer(obj.course_class).data,
@@ -29,32 +72,34 @@ class ExamSerializer(serializers.ModelSerializer):
             "major": MajorSerializer(obj.course_class.course.major).data,
             "clo_type": CLOTypeSerializer(obj.clo_type).data,
             "academic_program": AcademicProgramSerializer(obj.course_class.course.major.academic_program).data,
-            "total_students": total_students,
-            "pass_rate": obj.exam_results.with_metrics().filter(is_passed=True).count() / total_students * 100,
-            "clo_classification": {
-                "A": {
-                    "count": obj.exam_results.with_metrics().filter(letter_grade="A").count(),
-                    "percentage": obj.exam_results.with_metrics().filter(letter_grade="A").count() / total_students * 100
-                },
-                "B": {
-                    "count": obj.exam_results.with_metrics().filter(letter_grade="B").count(),
-                    "percentage": obj.exam_results.with_metrics().filter(letter_grade="B").count() / total_students * 100
-                },
-                "C": {
-                    "count": obj.exam_results.with_metrics().filter(letter_grade="C").count(),
-                    "percentage": obj.exam_results.with_metrics().filter(letter_grade="C").count() / total_students * 100
-                },
-                "D": {
-                    "count": obj.exam_results.with_metrics().filter(letter_grade="D").count(),
-                    "percentage": obj.exam_results.with_metrics().filter(letter_grade="D").count() / total_students * 100
-                },
-                "F": {
-                    "count": obj.exam_results.with_metrics().filter(letter_grade="F").count(),
-                    "percentage": obj.exam_results.with_metrics().filter(letter_grade="F").count() / total_students * 100
-                }
-            }
         }
 
+    def __percentage(self, count, total):
+        return count / total * 100 if total else 0
+
+def side_load_exam_hierarchy(exams):
+    """Classes, courses, majors, programs and CLO types referenced by a page of exams, each serialized once and keyed by id."""
+    related = {
+        "classes": (ClassSerializer, {}),
+        "courses": (CourseSerializer, {}),
+        "majors": (MajorSerializer, {}),
+        "academic_programs": (AcademicProgramSerializer, {}),
+        "clo_types": (CLOTypeSerializer, {}),
+    }
+
+    for exam in exams:
+        course = exam.course_class.course
+        related["classes"][1].setdefault(exam.course_class_id, exam.course_class)
+        related["courses"][1].setdefault(course.id, course)
+        related["majors"][1].setdefault(course.major_id, course.major)
+        related["academic_programs"][1].setdefault(course.major.academic_program_id, course.major.academic_program)
+        related["clo_types"][1].setdefault(exam.clo_type_id, exam.clo_type)
+
+    return {
+        key: {str(obj_id): serializer(obj).data for obj_id, obj in objs.items()}
+        for key, (serializer, objs) in related.items()
+    }
+
 class CreateExamSerializer(serializers.Serializer):
     course_class = serializers.PrimaryKeyRelatedField(queryset=Class.objects.filter(deleted_at=None))
     name = serializers.CharField()
@@ -87,4 +132,16 @@ class UpdateExamSerializer(serializers.Serializer):
     chapters = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=100), required=False)
     pass_expectation_rate = serializers.IntegerField(min_value=0, max_value=100, required=False)
     clo_pass_threshold = serializers.FloatField(min_value=0, max_value=10, required=False)
-    max_score = serializers.IntegerField(min_value=0, required=False)
\ No newline at end of file
+    max_score = serializers.IntegerField(min_value=0, required=False)
+
+class RegradeExamSerializer(serializers.Serializer):
+    chapters = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=100), required=False)
+    answer_key = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate(self, attrs):
+        _attrs = super().validate(attrs)
+
+        if "chapters" not in attrs and not attrs.get("answer_key"):
+            raise serializers.ValidationError("Vui lòng cung cấp danh sách chương hoặc đáp án cần cập nhật!")
+
+        return _attrs
\ No newline at end of file
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+from learngaugeapis.models.exam_ingestion_job import ExamIngestionJob
+
+class ExamIngestionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExamIngestionJob
+        exclude = ['answer_file', 'classification_file', 'student_answer_file']
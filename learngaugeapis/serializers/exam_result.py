@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.const.letter_grades import LetterGrade
+from learngaugeapis.helpers.exam_scoring import exam_result_metrics
+from learngaugeapis.models.exam_result import METRIC_FIELDS, ExamResult
 
 class ExamResultSerializer(serializers.ModelSerializer):
     metadata = serializers.SerializerMethodField()
@@ -9,14 +11,22 @@ class ExamResultSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_metadata(self, obj: ExamResult):
-        max_score = obj.exam.max_score * obj.exam.clo_type.weight/100
-        actual_score = (obj.total_correct_easy_questions + obj.total_correct_medium_questions)/(obj.total_easy_questions + obj.total_medium_questions) * max_score
-        score_on_scale_10 = actual_score / max_score * 10 if max_score != 0 else 0
-        letter_grade = "A" if score_on_scale_10 >= 8.5 else "B" if score_on_scale_10 >= 7 else "C" if score_on_scale_10 >= 5.5 else "D" if score_on_scale_10 >= 4 else "F"
-
-        return {
-            "max_score": max_score,
-            "actual_score": actual_score,
-            "score_on_scale_10": score_on_scale_10,
-            "letter_grade": letter_grade
-        }
\ No newline at end of file
+        # Results from with_metrics() carry the scores as annotations; anything else is scored in Python.
+        if hasattr(obj, "score_on_scale_10"):
+            return {field: getattr(obj, field) for field in METRIC_FIELDS}
+
+        return exam_result_metrics(obj.exam, obj)
+
+class ExamResultQuerySerializer(serializers.Serializer):
+    sort = serializers.ChoiceField(choices=["score", "-score", "student_code", "-student_code"], required=False, default="student_code")
+    letter_grade = serializers.CharField(required=False) # comma separated, e.g. A,B
+    is_passed = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate_letter_grade(self, value):
+        letter_grades = [letter_grade.strip().upper() for letter_grade in value.split(",") if letter_grade.strip()]
+        invalid_letter_grades = [letter_grade for letter_grade in letter_grades if letter_grade not in LetterGrade.values()]
+
+        if invalid_letter_grades:
+            raise serializers.ValidationError(f"Xếp loại không hợp lệ: {', '.join(invalid_letter_grades)}")
+
+        return letter_grades
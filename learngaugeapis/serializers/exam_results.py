@@ -11,6 +11,40 @@ def validate_file_extension(file):
         raise serializers.ValidationError("Chỉ cho phép file .xlsx hoặc .csv.")
 
 class UploadExamResultSerializer(CreateExamSerializer):
-    answer_file = serializers.FileField(validators=[validate_file_extension])
-    classification_file = serializers.FileField(validators=[validate_file_extension])
-    student_answer_file = serializers.FileField(validators=[validate_file_extension])
\ No newline at end of file
+    # Left out, the answers and chapters are taken from the course question bank.
+    answer_file = serializers.FileField(required=False, validators=[validate_file_extension])
+    classification_file = serializers.FileField(required=False, validators=[validate_file_extension])
+    student_answer_file = serializers.FileField(validators=[validate_file_extension])
+    background = serializers.BooleanField(required=False, allow_null=True, default=None)
+    dry_run = serializers.BooleanField(required=False, default=False)
+
+class CommitExamUploadSerializer(serializers.Serializer):
+    preview_token = serializers.CharField(max_length=255)
+
+def validate_archive_extension(file):
+    if os.path.splitext(file.name)[1].lower() != '.zip':
+        raise serializers.ValidationError("Chỉ cho phép file .zip.")
+
+class ImportExamBatchSerializer(serializers.Serializer):
+    archive = serializers.FileField(validators=[validate_archive_extension])
+
+class ExamBatchClassSerializer(serializers.Serializer):
+    course_class = serializers.IntegerField()
+    student_answer_file = serializers.CharField()
+    name = serializers.CharField(required=False)
+    description = serializers.CharField(required=False)
+
+class ExamBatchManifestSerializer(serializers.Serializer):
+    answer_file = serializers.CharField(required=False)
+    classification_file = serializers.CharField(required=False)
+    exam = serializers.DictField()
+    classes = ExamBatchClassSerializer(many=True, allow_empty=False)
+
+class UploadQuestionBankSerializer(serializers.Serializer):
+    answer_file = serializers.FileField(required=False, validators=[validate_file_extension])
+    classification_file = serializers.FileField(required=False, validators=[validate_file_extension])
+
+    def validate(self, attrs):
+        if not attrs.get("answer_file") and not attrs.get("classification_file"):
+            raise serializers.ValidationError("Vui lòng tải lên file đáp án hoặc file câu hỏi - chương!")
+        return attrs
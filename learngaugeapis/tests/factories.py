@@ -0,0 +1,52 @@
+import datetime
+
+import numpy as np
+from django.utils import timezone
+
+from learngaugeapis.helpers.exam_grading import AnswerMatrix
+from learngaugeapis.models.academic_program import AcademicProgram
+from learngaugeapis.models.clo_type import CLOType
+from learngaugeapis.models.course import Course
+from learngaugeapis.models.course_class import Class
+from learngaugeapis.models.major import Major
+from learngaugeapis.models.user import User, UserRole, UserStatus
+
+CHOICES = ["A", "B", "C", "D"]
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "learngauge-tests"}}
+
+def create_user(email, role=UserRole.TEACHER):
+    return User.objects.create(email=email, role=role, status=UserStatus.ACTIVATED)
+
+def create_course(code="CT101"):
+    academic_program = AcademicProgram.objects.create(code=f"ap-{code}", name="Chương trình", description="d")
+    major = Major.objects.create(academic_program=academic_program, code=f"m-{code}", name="Ngành", description="d")
+    return Course.objects.create(major=major, code=code, name=f"Học phần {code}")
+
+def create_classes(course, teacher, number_of_classes, **fields):
+    # Distinct created_at values keep the newest-first list order deterministic.
+    now = timezone.now()
+    classes = []
+
+    for index in range(number_of_classes):
+        class_ = Class.objects.create(course=course, teacher=teacher, code=f"{course.code}-{index}", name=f"Lớp {index}", **fields)
+        Class.objects.filter(id=class_.id).update(created_at=now - datetime.timedelta(minutes=index))
+        classes.append(class_)
+
+    return classes
+
+def create_clo_type(course, weight=100):
+    return CLOType.objects.create(course=course, name="CLO", description="d", is_evaluation=True, weight=weight)
+
+def make_answer_matrix(answers, answer_key):
+    encode = lambda row: [CHOICES.index(choice) + 1 for choice in row]
+    number_of_questions = len(answer_key)
+
+    return AnswerMatrix(
+        student_codes=[f"sv{index}" for index in range(len(answers))],
+        question_codes=[f"q{index}" for index in range(number_of_questions)],
+        choices=CHOICES,
+        answers=np.asarray([encode(row) for row in answers], dtype=np.uint8),
+        answer_key=np.asarray(encode(answer_key), dtype=np.uint8),
+        difficulties=np.asarray(["easy"] * number_of_questions, dtype=str),
+        question_chapters=[1] * number_of_questions,
+    )
@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase
+
+from learngaugeapis.helpers.answer_similarity import find_similar_pairs
+from learngaugeapis.tests.factories import make_answer_matrix
+
+class FindSimilarPairsTests(SimpleTestCase):
+    def test_single_wrong_choice_is_not_flagged(self):
+        # Everyone who got a question wrong picked B, so two students matching on it says nothing.
+        answer_matrix = make_answer_matrix(["BBBB", "BBBB", "AAAA", "AAAA", "BAAA"], "AAAA")
+
+        self.assertEqual(find_similar_pairs(answer_matrix, min_identical_wrong_answers=1, min_z_score=1), [])
+
+    def test_unusual_agreement_is_flagged(self):
+        answer_matrix = make_answer_matrix(
+            ["BBBB", "BBBB", "CDCD", "DCDC", "CCDD", "DDCC", "AAAA"],
+            "AAAA",
+        )
+
+        pairs = find_similar_pairs(answer_matrix, min_identical_wrong_answers=4, min_z_score=1)
+
+        self.assertEqual([(pair["student_code_a"], pair["student_code_b"]) for pair in pairs], [("sv0", "sv1")])
+        self.assertGreater(pairs[0]["z_score"], 1)
@@ -0,0 +1,61 @@
+import io
+import json
+import zipfile
+
+from django.test import TestCase
+
+from learngaugeapis.const.exam_formats import ExamFormat
+from learngaugeapis.helpers.exam_batch_import import MANIFEST_NAME, import_exam_archive
+from learngaugeapis.tests.factories import create_classes, create_clo_type, create_course, create_user
+
+STUDENT_ANSWERS = b"student_code,student_name\n" + b"sv1,Nguyen Van A\n" * 20
+
+def corrupt(archive, content):
+    # Flip one byte of a stored member, so reading it fails its CRC check.
+    offset = archive.index(content) + len(content) // 2
+    return archive[:offset] + bytes([archive[offset] ^ 0xFF]) + archive[offset + 1:]
+
+class ImportExamArchiveTests(TestCase):
+    def setUp(self):
+        course = create_course()
+        self.classes = create_classes(course, create_user("teacher@example.com"), 2)
+        self.clo_type = create_clo_type(course)
+
+    def make_archive(self, members):
+        buffer = io.BytesIO()
+
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zip_file:
+            zip_file.writestr(MANIFEST_NAME, json.dumps({
+                "exam": {
+                    "name": "Giữa kỳ",
+                    "description": "Bài thi giữa kỳ",
+                    "clo_type": self.clo_type.id,
+                    "exam_format": ExamFormat.all()[0][0],
+                    "chapters": [1],
+                    "pass_expectation_rate": 50,
+                    "clo_pass_threshold": 5,
+                    "max_score": 10,
+                },
+                "classes": [
+                    {"course_class": class_.id, "student_answer_file": f"{class_.id}.csv"}
+                    for class_ in self.classes
+                ],
+            }))
+
+            for name, content in members.items():
+                zip_file.writestr(name, content)
+
+        return buffer.getvalue()
+
+    def test_corrupt_member_fails_only_its_class(self):
+        archive = self.make_archive({f"{self.classes[0].id}.csv": STUDENT_ANSWERS})
+        report = import_exam_archive(io.BytesIO(corrupt(archive, STUDENT_ANSWERS)))
+
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual(
+            [class_report["errors"] for class_report in report["classes"]],
+            [
+                [f"File {self.classes[0].id}.csv trong file nén bị hỏng!"],
+                [f"Không tìm thấy file {self.classes[1].id}.csv trong file nén!"],
+            ],
+        )
@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_files import UploadLimits, load_and_validate_student_answer_file
+
+STREAMING = UploadLimits(streaming_min_bytes=0, chunk_rows=2)
+IN_MEMORY = UploadLimits()
+
+HEADER = ["MSSV", "STT", "Họ tên", "bench0001001d", "bench0001002t"]
+ROWS = [
+    [20201001, 1, "Nguyễn Văn A", "A", "B"],
+    [None, None, None, None, None],
+    [20201002, 2, "Trần Thị B", "C", None],
+    [20201003, 3, "Lê Văn C", "A", "D"],
+]
+
+def to_csv(header, rows):
+    return pd.DataFrame(rows, columns=header, dtype=object).to_csv(index=False).encode()
+
+def to_xlsx(header, rows):
+    buffer = io.BytesIO()
+    pd.DataFrame(rows, columns=header, dtype=object).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+class StudentAnswerFileTests(SimpleTestCase):
+    def load(self, content, file_format, limits):
+        try:
+            return load_and_validate_student_answer_file("bench", ContentFile(content, name=f"students.{file_format}"), limits)
+        except InvalidFileContentException as e:
+            return str(e)
+
+    def assertSameInBothModes(self, header, rows):
+        for file_format, write in [("csv", to_csv), ("xlsx", to_xlsx)]:
+            with self.subTest(file_format=file_format):
+                content = write(header, rows)
+                result = self.load(content, file_format, IN_MEMORY)
+
+                self.assertEqual(self.load(content, file_format, STREAMING), result)
+
+        return result
+
+    def test_blank_rows_are_dropped_in_both_modes(self):
+        data = self.assertSameInBothModes(HEADER, ROWS)
+
+        # The blank row must not turn the student codes into floats either.
+        self.assertEqual(list(data), ["20201001", "20201002", "20201003"])
+        self.assertEqual(data["20201002"]["answers"], {"bench0001001d": "c"})
+
+    def test_duplicate_headers_are_rejected_in_both_modes(self):
+        error = self.assertSameInBothModes(HEADER + ["bench0001001d"], [row + ["A"] for row in ROWS])
+
+        self.assertEqual(error, "File đáp án của sinh viên có 1 mã câu hỏi bị trùng lặp: bench0001001d")
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from learngaugeapis.const.exam_formats import ExamFormat
+from learngaugeapis.helpers.exam_ingestion import commit_upload_preview, create_exam_with_results, upload_preview_cache_key
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.models.question import Question
+from learngaugeapis.tests.factories import LOCMEM_CACHES, create_classes, create_clo_type, create_course, create_user, make_answer_matrix
+
+PREVIEW_TOKEN = "preview-token"
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CommitUploadPreviewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(
+            upload_preview_cache_key(PREVIEW_TOKEN),
+            {"exam_fields": {}, "student_answer_data": {}, "answer_matrix": None, "question_bank": None},
+        )
+
+    @mock.patch("learngaugeapis.helpers.exam_ingestion.create_exam_with_results")
+    def test_failed_insert_keeps_the_preview(self, create_exam_with_results):
+        exam = mock.Mock()
+        create_exam_with_results.side_effect = [DatabaseError("insert failed"), exam]
+
+        with self.assertRaises(DatabaseError):
+            commit_upload_preview(PREVIEW_TOKEN)
+
+        self.assertIsNotNone(cache.get(upload_preview_cache_key(PREVIEW_TOKEN)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIs(commit_upload_preview(PREVIEW_TOKEN), exam)
+
+        self.assertIsNone(commit_upload_preview(PREVIEW_TOKEN))
+        self.assertEqual(create_exam_with_results.call_count, 2)
+
+    @mock.patch("learngaugeapis.helpers.exam_ingestion.create_exam_with_results")
+    def test_preview_is_committed_once_while_the_insert_is_pending(self, create_exam_with_results):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.assertIsNotNone(commit_upload_preview(PREVIEW_TOKEN))
+            # The first insert has not committed yet, so its preview is still cached.
+            self.assertIsNone(commit_upload_preview(PREVIEW_TOKEN))
+
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(commit_upload_preview(PREVIEW_TOKEN))
+        self.assertEqual(create_exam_with_results.call_count, 1)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CreateExamWithResultsTests(TestCase):
+    def setUp(self):
+        course = create_course()
+        self.exam_fields = {
+            "course_class_id": create_classes(course, create_user("teacher@example.com"), 1)[0].id,
+            "clo_type_id": create_clo_type(course).id,
+            "name": "Giữa kỳ",
+            "description": "Bài thi giữa kỳ",
+            "exam_format": ExamFormat.all()[0][0],
+            "chapters": [1],
+            "pass_expectation_rate": 50,
+            "clo_pass_threshold": 5,
+            "max_score": 10,
+        }
+        self.answer_matrix = make_answer_matrix(["AB"], "AA")
+        self.student_answer_data = {
+            "sv0": {
+                "student_name": "Nguyễn Văn A",
+                "number_of_questions": 2,
+                "number_of_easy_questions": 2,
+                "number_of_medium_questions": 0,
+                "number_of_hard_questions": 0,
+                "number_of_correct_easy_questions": 1,
+                "number_of_correct_medium_questions": 0,
+                "number_of_correct_hard_questions": 0,
+            },
+        }
+
+    def test_question_bank_failure_rolls_back_the_exam(self):
+        with mock.patch.object(Question, "upsert_answer_data", side_effect=DatabaseError("upsert failed")):
+            with self.assertRaises(DatabaseError):
+                create_exam_with_results(self.exam_fields, self.student_answer_data, self.answer_matrix, {
+                    "answer_data": {"questions": {}},
+                    "classification_data": None,
+                })
+
+        self.assertFalse(Exam.objects.exists())
+        self.assertFalse(ExamResult.objects.exists())
+
+    def test_question_bank_is_saved_with_the_exam(self):
+        with mock.patch.object(Question, "upsert_answer_data") as upsert_answer_data:
+            exam = create_exam_with_results(self.exam_fields, self.student_answer_data, self.answer_matrix, {
+                "answer_data": {"questions": {}},
+                "classification_data": None,
+            })
+
+        upsert_answer_data.assert_called_once_with(exam.course_class.course, {"questions": {}})
+        self.assertEqual(exam.exam_results.count(), 1)
@@ -0,0 +1,104 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from learngaugeapis.const.exam_formats import ExamFormat
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.models.exam_statistics import ExamStatistics
+from learngaugeapis.tests.factories import create_classes, create_clo_type, create_course, create_user
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+# The dummy cache keeps the response cache out of the way, so every request reaches the view.
+@override_settings(CACHES=DUMMY_CACHES)
+class ExamQueryCountTests(APITestCase):
+    LIST_QUERIES = 3 # count, exams joined with their hierarchy, statistics
+    LIST_QUERIES_WITHOUT_STATISTICS = 5 # + one aggregate over every result of the page, + the upsert storing it
+    RETRIEVE_QUERIES = 2 # exam joined with its hierarchy, statistics
+
+    @classmethod
+    def setUpTestData(cls):
+        teacher = create_user("teacher@example.com")
+        cls.exams = []
+
+        for code in ["CT101", "CT102"]:
+            course = create_course(code)
+            clo_types = [create_clo_type(course, weight=60), create_clo_type(course, weight=40)]
+
+            for class_index, class_ in enumerate(create_classes(course, teacher, 2)):
+                for clo_type in clo_types:
+                    cls.exams.append(cls.create_exam(class_, clo_type, number_of_results=5 + class_index))
+
+    @classmethod
+    def create_exam(cls, class_, clo_type, number_of_results):
+        exam = Exam.objects.create(
+            course_class=class_,
+            clo_type=clo_type,
+            name=f"Bài thi {class_.code}",
+            exam_format=ExamFormat.all()[0][0],
+            chapters=[1, 2],
+            pass_expectation_rate=50,
+            clo_pass_threshold=5,
+        )
+        ExamResult.objects.bulk_create([
+            ExamResult(
+                exam=exam,
+                student_code=f"sv{index}",
+                student_name=f"Sinh viên {index}",
+                total_questions=10,
+                total_easy_questions=4,
+                total_medium_questions=4,
+                total_hard_questions=2,
+                total_correct_easy_questions=index % 5,
+                total_correct_medium_questions=index % 4,
+                total_correct_hard_questions=index % 3,
+            )
+            for index in range(number_of_results)
+        ])
+        return exam
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list_without_statistics(self):
+        ExamStatistics.objects.all().delete()
+
+        with self.assertNumQueries(self.LIST_QUERIES_WITHOUT_STATISTICS):
+            response = self.client.get(reverse("exams-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]["results"]), len(self.exams))
+        self.assertEqual(ExamStatistics.objects.count(), len(self.exams))
+
+    def test_list(self):
+        ExamStatistics.rebuild([exam.id for exam in self.exams])
+
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse("exams-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {result["id"]: result["metadata"]["total_students"] for result in response.data["data"]["results"]},
+            {exam.id: exam.exam_results.count() for exam in self.exams},
+        )
+
+    def test_list_does_not_grow_with_the_page(self):
+        ExamStatistics.rebuild([exam.id for exam in self.exams])
+
+        with self.assertNumQueries(self.LIST_QUERIES):
+            self.client.get(reverse("exams-list"), {"size": 1})
+
+        with self.assertNumQueries(self.LIST_QUERIES):
+            self.client.get(reverse("exams-list"), {"size": len(self.exams)})
+
+    def test_retrieve(self):
+        exam = self.exams[-1]
+        ExamStatistics.rebuild([exam.id])
+
+        with self.assertNumQueries(self.RETRIEVE_QUERIES):
+            response = self.client.get(reverse("exams-detail", args=[exam.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["metadata"]["total_students"], exam.exam_results.count())
+        self.assertEqual(response.data["data"]["metadata"]["course"]["code"], exam.course_class.course.code)
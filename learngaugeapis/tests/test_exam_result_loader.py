@@ -0,0 +1,78 @@
+from django.test import TestCase
+
+from learngaugeapis.const.exam_formats import ExamFormat
+from learngaugeapis.helpers.exam_result_loader import _bulk_create_rows, _CsvRowStream, exam_result_rows, load_exam_results
+from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_result import ExamResult
+from learngaugeapis.tests.factories import create_classes, create_clo_type, create_course, create_user
+
+STUDENT_ANSWER_DATA = {
+    "sv1": {"student_name": "Nguyễn Văn \"An\", K66", "exam_version": "0101"},
+    "sv2": {"student_name": "", "exam_version": None},
+    "sv3": {"student_name": "Trần Thị Bình", "exam_version": ""},
+}
+
+class CsvRowStreamTests(TestCase):
+    def test_only_none_is_written_unquoted_and_empty(self):
+        stream = _CsvRowStream([["a", None, 1, 2.5, "", 'x"y,z']])
+
+        self.assertEqual(stream.read(), b'"a",,1,2.5,"","x""y,z"\n')
+        self.assertEqual(stream.number_of_rows, 1)
+
+class LoadExamResultsTests(TestCase):
+    def setUp(self):
+        course = create_course()
+        class_ = create_classes(course, create_user("teacher@example.com"), 1)[0]
+        clo_type = create_clo_type(course)
+        self.exams = [
+            Exam.objects.create(
+                course_class=class_,
+                clo_type=clo_type,
+                name=f"Bài thi {index}",
+                exam_format=ExamFormat.all()[0][0],
+                chapters=[1],
+                pass_expectation_rate=50,
+                clo_pass_threshold=5,
+            )
+            for index in range(2)
+        ]
+        self.student_answer_data = {
+            student_code: {
+                **student_data,
+                "number_of_questions": 10,
+                "number_of_easy_questions": 4,
+                "number_of_medium_questions": 4,
+                "number_of_hard_questions": 2,
+                "number_of_correct_easy_questions": index,
+                "number_of_correct_medium_questions": 2,
+                "number_of_correct_hard_questions": 1,
+            }
+            for index, (student_code, student_data) in enumerate(STUDENT_ANSWER_DATA.items())
+        }
+
+    def stored_rows(self, exam):
+        return list(
+            ExamResult.objects.filter(exam=exam)
+            .order_by("student_code")
+            .values_list(
+                "student_code",
+                "student_name",
+                "exam_version",
+                "total_questions",
+                "total_easy_questions",
+                "total_correct_easy_questions",
+                "total_correct_hard_questions",
+            )
+        )
+
+    def test_copy_and_bulk_create_store_the_same_rows(self):
+        # On PostgreSQL load_exam_results goes through COPY; elsewhere both sides use bulk_create.
+        copied = load_exam_results(self.exams[0], self.student_answer_data)
+        created = _bulk_create_rows(ExamResult, exam_result_rows(self.exams[1], self.student_answer_data))
+
+        self.assertEqual(copied, created)
+        self.assertEqual(self.stored_rows(self.exams[0]), self.stored_rows(self.exams[1]))
+        self.assertEqual(
+            [(student_name, exam_version) for _, student_name, exam_version, *_ in self.stored_rows(self.exams[0])],
+            [('Nguyễn Văn "An", K66', "0101"), ("", None), ("Trần Thị Bình", "")],
+        )
@@ -0,0 +1,88 @@
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from learngaugeapis.helpers.paginator import CustomPageNumberPagination, KeysetPagination
+from learngaugeapis.models.user import UserRole
+from learngaugeapis.tests.factories import create_classes, create_course, create_user
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+@override_settings(CACHES=DUMMY_CACHES)
+class ConcurrentPaginationTests(TransactionTestCase):
+    def setUp(self):
+        self.classes = create_classes(create_course(), create_user("teacher@example.com"), 2)
+        self.root = create_user("root@example.com", role=UserRole.ROOT)
+
+    def test_concurrent_pages_do_not_share_state(self):
+        # Both requests paginate before either builds its response, as when a background refresh overlaps a request.
+        barrier = threading.Barrier(2)
+        paginate_queryset = CustomPageNumberPagination.paginate_queryset
+
+        def paginate_then_wait(paginator, queryset, request, view=None):
+            page = paginate_queryset(paginator, queryset, request, view)
+            barrier.wait(5)
+            return page
+
+        responses = {}
+
+        def get(page):
+            try:
+                client = APIClient()
+                client.force_authenticate(user=self.root)
+                responses[page] = client.get(reverse("classes-list"), {"size": 1, "page": page}).data["data"]
+            finally:
+                connection.close()
+
+        with mock.patch.object(CustomPageNumberPagination, "paginate_queryset", paginate_then_wait):
+            threads = [threading.Thread(target=get, args=[page]) for page in [1, 2]]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(10)
+
+        for page in [1, 2]:
+            self.assertEqual(responses[page]["current_page"], page)
+            self.assertEqual([class_["id"] for class_ in responses[page]["results"]], [self.classes[page - 1].id])
+
+@override_settings(CACHES=DUMMY_CACHES)
+class CursorValidationTests(TestCase):
+    def setUp(self):
+        self.classes = create_classes(create_course(), create_user("teacher@example.com"), 3)
+        self.client = APIClient()
+        self.client.force_authenticate(user=create_user("root@example.com", role=UserRole.ROOT))
+
+    def get_classes(self, cursor):
+        return self.client.get(reverse("classes-list"), {"cursor": cursor, "size": 1})
+
+    def test_next_cursor_is_accepted(self):
+        first = self.get_classes("")
+        second = self.get_classes(first.data["data"]["next_cursor"])
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual([class_["id"] for class_ in second.data["data"]["results"]], [self.classes[1].id])
+
+    def test_malformed_cursor_is_rejected(self):
+        cursors = [
+            "not base64!",
+            KeysetPagination().encode_cursor({"id": "x"}),
+            KeysetPagination().encode_cursor(["2025-01-01T00:00:00+00:00"]),
+            KeysetPagination().encode_cursor(["2025-01-01T00:00:00+00:00", "x"]),
+            KeysetPagination().encode_cursor(["yesterday", 1]),
+            KeysetPagination().encode_cursor([None, 1]),
+            KeysetPagination().encode_cursor([["2025-01-01T00:00:00+00:00"], 1]),
+            KeysetPagination().encode_cursor(["2025-01-01T00:00:00+00:00", 2 ** 70]),
+        ]
+
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.get_classes(cursor)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["message"], "Cursor không hợp lệ!")
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from learngaugeapis.models.user import UserRole
+from learngaugeapis.tests.factories import LOCMEM_CACHES, create_classes, create_course, create_user
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ClassListCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = create_course()
+        self.teacher = create_user("teacher@example.com")
+        self.classes = create_classes(self.course, self.teacher, 4, year=2025)
+        self.client = APIClient()
+        self.client.force_authenticate(user=create_user("root@example.com", role=UserRole.ROOT))
+
+    def get_classes(self, **params):
+        response = self.client.get(reverse("classes-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["data"]
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.get_classes(size=2)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_classes(size=2), first)
+
+    def test_delete_refreshes_later_pages(self):
+        page_2 = self.get_classes(size=1, page=2)
+        self.assertEqual([class_["id"] for class_ in page_2["results"]], [self.classes[1].id])
+        self.assertEqual(page_2["total_page"], 4)
+
+        # The deleted class is on page 1, so page 2 holds none of its tags.
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse("classes-detail", args=[self.classes[0].id]))
+        self.assertEqual(response.status_code, 200)
+
+        page_2 = self.get_classes(size=1, page=2)
+        self.assertEqual([class_["id"] for class_ in page_2["results"]], [self.classes[2].id])
+        self.assertEqual(page_2["total_page"], 3)
+
+    def test_update_moves_class_into_filtered_list(self):
+        self.assertEqual(self.get_classes(year=2030)["results"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(reverse("classes-detail", args=[self.classes[3].id]), {"year": 2030}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual([class_["id"] for class_ in self.get_classes(year=2030)["results"]], [self.classes[3].id])
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from learngaugeapis.helpers.response_cache import cache_response, response_cache_key, response_cache_stats
+from learngaugeapis.tests.factories import LOCMEM_CACHES
+
+NUMBER_OF_REQUESTS = 8
+
+class WidgetView:
+    action = "list"
+
+    def __init__(self, body):
+        self.body = body
+
+    @cache_response("widgets", single_flight=True)
+    def list(self, request):
+        return Response({"version": self.body()})
+
+class CountingBody:
+    """Counts its runs; every run after the first blocks until release is set, standing in for a slow recompute."""
+
+    def __init__(self, duration=0):
+        self.duration = duration
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.refreshing = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+
+        if call > 1:
+            self.refreshing.set()
+            self.release.wait(5)
+
+        time.sleep(self.duration)
+        return call
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def make_request(self):
+        return Request(APIRequestFactory().get("/widgets"))
+
+    def get_concurrently(self, view):
+        barrier = threading.Barrier(NUMBER_OF_REQUESTS)
+        responses = [None] * NUMBER_OF_REQUESTS
+
+        def get(index):
+            barrier.wait()
+            responses[index] = view.list(self.make_request())
+
+        threads = [threading.Thread(target=get, args=[index]) for index in range(NUMBER_OF_REQUESTS)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(10)
+
+        return responses
+
+    def test_concurrent_misses_compute_once(self):
+        body = CountingBody(duration=0.2)
+        responses = self.get_concurrently(WidgetView(body))
+
+        self.assertEqual(body.calls, 1)
+        self.assertEqual([(response.status_code, response.data) for response in responses], [(200, {"version": 1})] * NUMBER_OF_REQUESTS)
+        self.assertEqual(response_cache_stats()["widgets"]["misses"], NUMBER_OF_REQUESTS)
+        self.assertEqual(response_cache_stats()["widgets"]["computes"], 1)
+
+    @override_settings(RESPONSE_CACHE_SOFT_TIMEOUT=0)
+    def test_stale_entry_is_served_while_one_refresh_runs(self):
+        body = CountingBody()
+        view = WidgetView(body)
+        self.assertEqual(view.list(self.make_request()).data, {"version": 1})
+
+        # The refresh blocks until released, so every request below finds the entry stale and the refresh still running.
+        responses = self.get_concurrently(view)
+        self.assertTrue(body.refreshing.wait(5))
+
+        self.assertEqual([response.data for response in responses], [{"version": 1}] * NUMBER_OF_REQUESTS)
+        self.assertEqual(body.calls, 2)
+
+        body.release.set()
+        key = response_cache_key("widgets", "list", self.make_request())
+        deadline = time.monotonic() + 5
+
+        while cache.get(key)["data"] != {"version": 2} and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(cache.get(key)["data"], {"version": 2})
+        self.assertEqual(body.calls, 2)
+        self.assertEqual(response_cache_stats()["widgets"]["stale"], NUMBER_OF_REQUESTS)
@@ -8,6 +8,7 @@ from learngaugeapis.views.course import CourseView
 from learngaugeapis.views.course_class import ClassView
 from learngaugeapis.views.health import HealthCheckView
 from learngaugeapis.views.major import MajorView
+from learngaugeapis.views.monitoring import ResponseCacheStatsView
 from learngaugeapis.views.root_user import RootUserView
 from learngaugeapis.views.student import StudentView
 from learngaugeapis.views.user import UserView
@@ -31,4 +32,5 @@ router.register('exams', ExamView, "exams")
 urlpatterns = [
    path('', include(router.urls)),
    path('health/', HealthCheckView.as_view(), name='health-check'),
+   path('monitoring/response-cache', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
 ]
\ No newline at end of file
@@ -8,13 +8,14 @@ from drf_yasg.utils import swagger_auto_schema
 from learngaugeapis.models.academic_program import AcademicProgram
 from learngaugeapis.serializers.academic_program import AcademicProgramSerializer, CreateAcademicProgramSerializer, UpdateAcademicProgramSerializer
 from learngaugeapis.helpers.response import RestResponse
+from learngaugeapis.helpers.response_cache import add_response_tags, cache_response, entity_tag, invalidate_tags
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.middlewares.permissions import IsRoot
 from learngaugeapis.helpers.paginator import CustomPageNumberPagination
 
 class AcademicProgramView(ViewSet):
     authentication_classes = [UserAuthentication]
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy']:
@@ -44,6 +45,7 @@ class AcademicProgramView(ViewSet):
             )
         ]
     )
+    @cache_response("academic_programs")
     def list(self, request):
         try:
             logging.getLogger().info("AcademicProgramView.list req=%s", request.query_params)
@@ -53,17 +55,21 @@ class AcademicProgramView(ViewSet):
             if name:
                 academic_programs = academic_programs.filter(name__icontains=name)
                 
-            academic_programs = self.paginator.paginate_queryset(academic_programs, request)
+            paginator = self.pagination_class()
+            academic_programs = paginator.paginate_queryset(academic_programs, request)
+            add_response_tags(request, *(entity_tag("academic_program", academic_program.id) for academic_program in academic_programs))
             serializer = AcademicProgramSerializer(academic_programs, many=True)
-            return RestResponse(status=status.HTTP_200_OK, data=self.paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
         except Exception as e:
             logging.getLogger().exception("AcademicProgramView.list exc=%s, req=%s", str(e), request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
     
+    @cache_response("academic_programs")
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("AcademicProgramView.retrieve pk=%s", pk)
             academic_program = AcademicProgram.objects.get(id=pk, deleted_at=None)
+            add_response_tags(request, entity_tag("academic_program", academic_program.id))
             serializer = AcademicProgramSerializer(academic_program)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except AcademicProgram.DoesNotExist:
@@ -87,6 +93,7 @@ class AcademicProgramView(ViewSet):
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Mã chương trình đào tạo đã được sử dụng!").response
 
             academic_program = AcademicProgram.objects.create(**validated_data)
+            invalidate_tags("academic_programs")
             return RestResponse(status=status.HTTP_201_CREATED, data=AcademicProgramSerializer(academic_program).data).response
         except Exception as e:
             logging.getLogger().exception("AcademicProgramView.create exc=%s, req=%s", str(e), request.data)
@@ -111,6 +118,7 @@ class AcademicProgramView(ViewSet):
                 setattr(academic_program, key, value)
 
             academic_program.save()
+            invalidate_tags("academic_programs", entity_tag("academic_program", academic_program.id))
             return RestResponse(status=status.HTTP_200_OK, data=AcademicProgramSerializer(academic_program).data).response
         except AcademicProgram.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
@@ -124,6 +132,7 @@ class AcademicProgramView(ViewSet):
             academic_program = AcademicProgram.objects.get(id=pk, deleted_at=None)
             academic_program.deleted_at = datetime.now()
             academic_program.save()
+            invalidate_tags("academic_programs", entity_tag("academic_program", academic_program.id))
             return RestResponse(status=status.HTTP_200_OK).response
         except AcademicProgram.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
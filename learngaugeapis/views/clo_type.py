@@ -5,17 +5,24 @@ from rest_framework.viewsets import ViewSet
 from rest_framework import status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from django.db import transaction
 from learngaugeapis.models.clo_type import CLOType
+from learngaugeapis.models.exam_statistics import ExamStatistics
 from learngaugeapis.helpers.response import RestResponse
+from learngaugeapis.helpers.response_cache import add_response_tags, cache_response, entity_tag, invalidate_tags
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.serializers.clo_type import CreateCLOTypeSerializer, CLOTypeSerializer, UpdateCLOTypeSerializer
 from learngaugeapis.middlewares.permissions import IsRoot
 from learngaugeapis.helpers.paginator import CustomPageNumberPagination
 from learngaugeapis.serializers.clo_type import BulkCreateCLOTypeSerializer
 
+def clo_type_tags(clo_type: CLOType):
+    # CLOTypeSerializer nests the course.
+    return [entity_tag("clo_type", clo_type.id), entity_tag("course", clo_type.course_id)]
+
 class CLOTypeView(ViewSet):
     authentication_classes = [UserAuthentication]
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy']:
@@ -63,6 +70,7 @@ class CLOTypeView(ViewSet):
             )
         ]
     )   
+    @cache_response("clo_types")
     def list(self, request):
         try:
             logging.getLogger().info("CLOTypeView.list req=%s", request.query_params)
@@ -84,16 +92,20 @@ class CLOTypeView(ViewSet):
             if class_id:
                 clo_types = clo_types.filter(course__classes__id=class_id)
 
-            clo_types = self.paginator.paginate_queryset(clo_types, request)
+            paginator = self.pagination_class()
+            clo_types = paginator.paginate_queryset(clo_types, request)
+            add_response_tags(request, *(tag for clo_type in clo_types for tag in clo_type_tags(clo_type)))
             return RestResponse(status=status.HTTP_200_OK, data=CLOTypeSerializer(clo_types, many=True).data).response
         except Exception as e:
             logging.getLogger().exception("CLOTypeView.list exc=%s, req=%s", str(e), request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
         
+    @cache_response("clo_types")
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("CLOTypeView.retrieve pk=%s", pk)
             clo_type : CLOType = CLOType.objects.get(pk=pk, deleted_at=None)
+            add_response_tags(request, *clo_type_tags(clo_type))
             return RestResponse(status=status.HTTP_200_OK, data=CLOTypeSerializer(clo_type).data).response
         except CLOType.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
@@ -116,6 +128,7 @@ class CLOTypeView(ViewSet):
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Đã có CLO đánh giá cho khóa học này!").response
             
             clo_type : CLOType = CLOType.objects.create(**serializer.validated_data)
+            invalidate_tags("clo_types")
             
             return RestResponse(status=status.HTTP_201_CREATED, data=CLOTypeSerializer(clo_type).data).response
         except Exception as e:
@@ -148,6 +161,7 @@ class CLOTypeView(ViewSet):
                 for clo_type 
                 in serializer.validated_data['clo_types']
             ])
+            invalidate_tags("clo_types")
             return RestResponse(status=status.HTTP_201_CREATED, data=CLOTypeSerializer(clo_types, many=True).data).response
         except Exception as e:
             logging.getLogger().exception("CLOTypeView.bulk_create exc=%s, req=%s", str(e), request.data)
@@ -168,10 +182,20 @@ class CLOTypeView(ViewSet):
             if is_evaluation and CLOType.objects.filter(course=serializer.validated_data.get('course'), is_evaluation=True).exists():
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Đã có CLO đánh giá cho khóa học này!").response
             
+            weight_changed = "weight" in serializer.validated_data and serializer.validated_data["weight"] != clo_type.weight
+
             for key, value in serializer.validated_data.items():
                 setattr(clo_type, key, value)
 
-            clo_type.save()
+            with transaction.atomic():
+                clo_type.save()
+
+                if weight_changed:
+                    ExamStatistics.invalidate(clo_type.exams.values("id"))
+
+                # Exams carry their CLO type's tag, so this also drops the exam responses whose scores use the weight;
+                # the collection tag covers lists the update moves the CLO type into or out of.
+                invalidate_tags("clo_types", entity_tag("clo_type", clo_type.id))
             
             return RestResponse(status=status.HTTP_200_OK, data=CLOTypeSerializer(clo_type).data).response
         except CLOType.DoesNotExist:
@@ -186,6 +210,7 @@ class CLOTypeView(ViewSet):
             clo_type : CLOType = CLOType.objects.get(pk=pk, deleted_at=None)
             clo_type.deleted_at = datetime.now()
             clo_type.save()
+            invalidate_tags("clo_types", entity_tag("clo_type", clo_type.id))
             return RestResponse(status=status.HTTP_204_NO_CONTENT).response
         except CLOType.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
@@ -4,17 +4,23 @@ from rest_framework import status
 from rest_framework.viewsets import ViewSet
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 
+from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.helpers.exam_ingestion import check_upload_sizes, parse_files, read_upload, save_question_bank
 from learngaugeapis.helpers.response import RestResponse
+from learngaugeapis.helpers.response_cache import add_response_tags, cache_response, entity_tag, invalidate_tags
 from learngaugeapis.helpers.paginator import CustomPageNumberPagination
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.middlewares.permissions import IsRoot
 from learngaugeapis.models.course import Course
 from learngaugeapis.serializers.course import CourseSerializer, CreateCourseSerializer, UpdateCourseSerializer
+from learngaugeapis.serializers.exam_results import UploadQuestionBankSerializer
 
 class CourseView(ViewSet):
     authentication_classes = [UserAuthentication]
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy']:
@@ -50,6 +56,7 @@ class CourseView(ViewSet):
             )
         ]
     )
+    @cache_response("courses")
     def list(self, request):
         try:
             logging.getLogger().info("CourseView.list req=%s", request.data)
@@ -63,17 +70,21 @@ class CourseView(ViewSet):
             if name:
                 courses = courses.filter(name__icontains=name)
 
-            courses = self.paginator.paginate_queryset(courses, request)
+            paginator = self.pagination_class()
+            courses = paginator.paginate_queryset(courses, request)
+            add_response_tags(request, *(entity_tag("course", course.id) for course in courses))
             serializer = CourseSerializer(courses, many=True)
-            return RestResponse(status=status.HTTP_200_OK, data=self.paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
         except Exception as e:
             logging.getLogger().exception("CourseView.list exc=%s, req=%s", str(e), request.data)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
         
+    @cache_response("courses")
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("CourseView.retrieve pk=%s, req=%s", pk, request.data)
             course = Course.objects.get(id=pk, deleted_at=None)
+            add_response_tags(request, entity_tag("course", course.id))
             serializer = CourseSerializer(course)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except Course.DoesNotExist:
@@ -97,6 +108,7 @@ class CourseView(ViewSet):
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Mã khóa học đã tồn tại!").response
 
             course = Course.objects.create(**validated_data)
+            invalidate_tags("courses")
 
             return RestResponse(status=status.HTTP_201_CREATED, data=CourseSerializer(course).data).response
         except Exception as e:
@@ -122,6 +134,7 @@ class CourseView(ViewSet):
                 setattr(course, key, value)
 
             course.save()
+            invalidate_tags("courses", entity_tag("course", course.id))
 
             return RestResponse(status=status.HTTP_200_OK, data=CourseSerializer(course).data).response
         except Course.DoesNotExist:
@@ -136,9 +149,43 @@ class CourseView(ViewSet):
             course = Course.objects.get(id=pk, deleted_at=None)
             course.deleted_at = datetime.datetime.now()
             course.save()
+            invalidate_tags("courses", entity_tag("course", course.id))
             return RestResponse(status=status.HTTP_200_OK).response
         except Course.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
         except Exception as e:
             logging.getLogger().exception("CourseView.destroy exc=%s, pk=%s", str(e), pk)
-            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
\ No newline at end of file
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
+
+    @swagger_auto_schema(request_body=UploadQuestionBankSerializer)
+    @action(detail=True, methods=['post'], url_path='question-bank', parser_classes=[MultiPartParser])
+    def upload_question_bank(self, request, pk=None):
+        try:
+            logging.getLogger().info("CourseView.upload_question_bank pk=%s, req=%s", pk, request.data)
+            course = Course.objects.get(id=pk, deleted_at=None)
+            serializer = UploadQuestionBankSerializer(data=request.data)
+
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors).response
+
+            files = {
+                kind: serializer.validated_data.get(f"{kind}_file")
+                for kind in ["answer", "classification"]
+                if serializer.validated_data.get(f"{kind}_file") is not None
+            }
+            check_upload_sizes(*files.values())
+
+            parsed = dict(zip(files.keys(), parse_files(course.code, [read_upload(kind, file) for kind, file in files.items()])))
+            save_question_bank(course, parsed.get("answer"), parsed.get("classification"))
+
+            return RestResponse(status=status.HTTP_200_OK, data={
+                "total_questions": course.questions.count(),
+                "total_exam_versions": course.exam_versions.count(),
+            }).response
+        except Course.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except InvalidFileContentException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
+        except Exception as e:
+            logging.getLogger().exception("CourseView.upload_question_bank exc=%s, pk=%s", str(e), pk)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
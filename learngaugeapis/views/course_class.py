@@ -6,15 +6,21 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 from learngaugeapis.helpers.response import RestResponse
-from learngaugeapis.helpers.paginator import CustomPageNumberPagination
+from learngaugeapis.helpers.response_cache import add_response_tags, cache_response, entity_tag, invalidate_tags
+from learngaugeapis.errors.exceptions import InvalidCursorException
+from learngaugeapis.helpers.paginator import CustomPageNumberPagination, get_list_paginator
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.middlewares.permissions import IsRoot
 from learngaugeapis.models.course_class import Class
 from learngaugeapis.serializers.course_class import ClassSerializer, CreateClassSerializer, UpdateClassSerializer
 
+# Exam lists filter on the class's course, year and semester, and CLO type lists on its course, so moving or
+# deleting a class changes which entries those lists hold, not only the entries about the class itself.
+CLASS_FILTERED_COLLECTIONS = ["classes", "exams", "clo_types"]
+
 class ClassView(ViewSet):
     authentication_classes = [UserAuthentication]
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy']:
@@ -36,6 +42,20 @@ class ClassView(ViewSet):
                 type=openapi.TYPE_INTEGER,
                 required=False
             ),
+            openapi.Parameter(
+                name="cursor",
+                in_="query",
+                type=openapi.TYPE_STRING,
+                description="Cursor pagination: empty for the first page, then next_cursor",
+                required=False
+            ),
+            openapi.Parameter(
+                name="total",
+                in_="query",
+                type=openapi.TYPE_BOOLEAN,
+                description="Cursor pagination: include the (cached) total",
+                required=False
+            ),
             openapi.Parameter(
                 name="course_id",
                 in_="query",
@@ -62,6 +82,7 @@ class ClassView(ViewSet):
             )
         ]
     )
+    @cache_response("classes")
     def list(self, request):
         try:
             logging.getLogger().info("ClassView.list req=%s", request.query_params)
@@ -83,17 +104,23 @@ class ClassView(ViewSet):
             if year:
                 classes = classes.filter(year=year)
 
-            classes = self.paginator.paginate_queryset(classes, request)
+            paginator = get_list_paginator(request, self.pagination_class)
+            classes = paginator.paginate_queryset(classes, request)
+            add_response_tags(request, *(entity_tag("class", class_.id) for class_ in classes))
             serializer = ClassSerializer(classes, many=True)
-            return RestResponse(status=status.HTTP_200_OK, data=self.paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+        except InvalidCursorException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
         except Exception as e:
             logging.getLogger().exception("ClassView.list exc=%s, req=%s", str(e), request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
         
+    @cache_response("classes")
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("ClassView.retrieve pk=%s", pk)
             class_ = Class.objects.get(id=pk, deleted_at=None)
+            add_response_tags(request, entity_tag("class", class_.id))
             serializer = ClassSerializer(class_)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except Class.DoesNotExist:
@@ -117,6 +144,7 @@ class ClassView(ViewSet):
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Mã lớp đã tồn tại!").response
 
             _class = Class.objects.create(**validated_data)
+            invalidate_tags("classes")
             return RestResponse(status=status.HTTP_201_CREATED, data=ClassSerializer(_class).data).response
         except Exception as e:
             logging.getLogger().exception("ClassView.create exc=%s, req=%s", str(e), request.data)
@@ -141,6 +169,7 @@ class ClassView(ViewSet):
                 setattr(_class, key, value)
 
             _class.save()
+            invalidate_tags(entity_tag("class", _class.id), *CLASS_FILTERED_COLLECTIONS)
 
             return RestResponse(status=status.HTTP_200_OK, data=ClassSerializer(_class).data).response
         except Class.DoesNotExist:
@@ -155,6 +184,7 @@ class ClassView(ViewSet):
             _class = Class.objects.get(id=pk, deleted_at=None)
             _class.deleted_at = datetime.datetime.now()
             _class.save()
+            invalidate_tags(entity_tag("class", _class.id), *CLASS_FILTERED_COLLECTIONS)
             return RestResponse(status=status.HTTP_200_OK).response
         except Class.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
@@ -6,24 +6,66 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser
-import pandas as pd
-import numpy as np
-from django.db import transaction
-
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from learngaugeapis.helpers.answer_similarity import analyze_exam_similarity
+from learngaugeapis.helpers.exam_batch_import import import_exam_archive
+from learngaugeapis.helpers.exam_grading import grade_student_answers
+from learngaugeapis.helpers.exam_ingestion import commit_upload_preview, create_exam_with_results, create_ingestion_job, create_upload_preview, get_exam_fields, parse_exam_upload, submit_ingestion_job
+from learngaugeapis.helpers.exam_regrade import regrade_exam
+from learngaugeapis.helpers.exam_version_statistics import version_statistics
+from learngaugeapis.helpers.item_analysis import analyze_items
 from learngaugeapis.helpers.response import RestResponse
-from learngaugeapis.helpers.paginator import CustomPageNumberPagination
+from learngaugeapis.helpers.response_cache import add_response_tags, cache_response, entity_tag, invalidate_tags
+from learngaugeapis.helpers.paginator import CustomPageNumberPagination, KeysetPagination, get_list_paginator
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.middlewares.permissions import IsRoot
 from learngaugeapis.models.course import Course
+from learngaugeapis.models.answer_similarity import AnswerSimilarityReport
 from learngaugeapis.models.exam import Exam
+from learngaugeapis.models.exam_answer_matrix import ExamAnswerMatrix
+from learngaugeapis.models.exam_ingestion_job import ExamIngestionJob
 from learngaugeapis.models.exam_result import ExamResult
-from learngaugeapis.serializers.exam import CreateExamSerializer, ExamSerializer, UpdateExamSerializer
-from learngaugeapis.serializers.exam_results import UploadExamResultSerializer
-from learngaugeapis.errors.exceptions import InvalidFileContentException
+from learngaugeapis.models.exam_result_chapter import ExamResultChapter
+from learngaugeapis.models.exam_statistics import ExamStatistics
+from learngaugeapis.serializers.answer_similarity import AnalyzeAnswerSimilaritySerializer, AnswerSimilarityReportSerializer
+from learngaugeapis.serializers.exam import EXAM_HIERARCHY_RELATED, CreateExamSerializer, ExamSerializer, RegradeExamSerializer, UpdateExamSerializer, side_load_exam_hierarchy
+from learngaugeapis.serializers.exam_ingestion_job import ExamIngestionJobSerializer
+from learngaugeapis.serializers.exam_result import ExamResultQuerySerializer, ExamResultSerializer
+from learngaugeapis.serializers.exam_results import CommitExamUploadSerializer, ImportExamBatchSerializer, UploadExamResultSerializer
+from learngaugeapis.errors.exceptions import InvalidCursorException, InvalidFileContentException
+
+ITEM_ANALYSIS_CACHE_TIMEOUT = 60 * 60 * 24
+RESULT_SORT_FIELDS = {"score": "score_on_scale_10", "student_code": "student_code"}
+
+def get_expand(request):
+    return set(filter(None, request.query_params.get("expand", "").split(",")))
+
+def get_exams(expand):
+    exams = Exam.objects.filter(deleted_at=None).select_related(*EXAM_HIERARCHY_RELATED)
+
+    if "results" in expand:
+        exams = exams.prefetch_related(Prefetch("exam_results", queryset=ExamResult.objects.with_metrics().order_by("student_code", "id")))
+
+    return exams
+
+def exam_cache_tags(exam: Exam):
+    # The exam response embeds (or side-loads) its whole hierarchy; get_exams has already joined it.
+    course = exam.course_class.course
+    return [
+        entity_tag("exam", exam.id),
+        entity_tag("class", exam.course_class_id),
+        entity_tag("course", course.id),
+        entity_tag("major", course.major_id),
+        entity_tag("academic_program", course.major.academic_program_id),
+        entity_tag("clo_type", exam.clo_type_id),
+    ]
 
 class ExamView(ViewSet):
     # authentication_classes = [UserAuthentication]
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     # def get_permissions(self):
     #     if self.action in ['create', 'update', 'destroy']:
@@ -45,6 +87,20 @@ class ExamView(ViewSet):
                 type=openapi.TYPE_INTEGER,
                 required=False
             ),
+            openapi.Parameter(
+                name="cursor",
+                in_="query",
+                type=openapi.TYPE_STRING,
+                description="Cursor pagination: empty for the first page, then next_cursor",
+                required=False
+            ),
+            openapi.Parameter(
+                name="total",
+                in_="query",
+                type=openapi.TYPE_BOOLEAN,
+                description="Cursor pagination: include the (cached) total",
+                required=False
+            ),
             openapi.Parameter(
                 name="class",
                 in_="query",
@@ -74,13 +130,22 @@ class ExamView(ViewSet):
                 in_="query",
                 type=openapi.TYPE_INTEGER,
                 required=False
+            ),
+            openapi.Parameter(
+                name="expand",
+                in_="query",
+                type=openapi.TYPE_STRING,
+                description="results: include every student's result",
+                required=False
             )
         ]
     )
+    @cache_response("exams", single_flight=True)
     def list(self, request):
         try:
             logging.getLogger().info("ExamView.list params=%s", request.query_params)
-            exams = Exam.objects.filter(deleted_at=None).order_by("-created_at")
+            expand = get_expand(request)
+            exams = get_exams(expand).order_by("-created_at")
 
             class_id = request.query_params.get("class", None)
             if class_id:
@@ -102,18 +167,39 @@ class ExamView(ViewSet):
             if semester:
                 exams = exams.filter(course_class__semester=semester)
 
-            exams = self.paginator.paginate_queryset(exams, request)
-            serializer = ExamSerializer(exams, many=True)
-            return RestResponse(status=status.HTTP_200_OK, data=self.paginator.get_paginated_data(serializer.data)).response
+            paginator = get_list_paginator(request, self.pagination_class)
+            exams = paginator.paginate_queryset(exams, request)
+            add_response_tags(request, *(tag for exam in exams for tag in exam_cache_tags(exam)))
+            exam_statistics = ExamStatistics.for_exams([exam.id for exam in exams])
+            serializer = ExamSerializer(exams, many=True, context={"exam_statistics": exam_statistics, "expand": expand, "side_load": True})
+            data = paginator.get_paginated_data(serializer.data)
+            data["included"] = side_load_exam_hierarchy(exams)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
+        except InvalidCursorException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
         except Exception as e:
             logging.getLogger().error("ExamView.list exc=%s", str(e))
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
         
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                name="expand",
+                in_="query",
+                type=openapi.TYPE_STRING,
+                description="results: include every student's result",
+                required=False
+            )
+        ]
+    )
+    @cache_response("exams", single_flight=True)
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("ExamView.retrieve pk=%s", pk)
-            exam = Exam.objects.get(id=pk, deleted_at=None)
-            serializer = ExamSerializer(exam)
+            expand = get_expand(request)
+            exam = get_exams(expand).get(id=pk)
+            add_response_tags(request, *exam_cache_tags(exam))
+            serializer = ExamSerializer(exam, context={"expand": expand})
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except Exam.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
@@ -168,6 +254,7 @@ class ExamView(ViewSet):
             exam = Exam.objects.get(id=pk, deleted_at=None)
             exam.deleted_at = datetime.now()
             exam.save()
+            invalidate_tags("exams", entity_tag("exam", exam.id))
             return RestResponse(status=status.HTTP_204_NO_CONTENT).response
         except Exam.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
@@ -192,49 +279,40 @@ class ExamView(ViewSet):
             if not course.clo_types.filter(is_evaluation=True, deleted_at=None).exists():
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Vui lòng cài đặt CLO đánh giá cho khóa học trước khi thực hiện thao tác này!").response
 
-            answer_file = validated_data.pop('answer_file')
-            classification_file = validated_data.pop('classification_file')
+            answer_file = validated_data.pop('answer_file', None)
+            classification_file = validated_data.pop('classification_file', None)
             student_answer_file = validated_data.pop('student_answer_file')
+            background = validated_data.pop('background')
+            dry_run = validated_data.pop('dry_run')
+            exam_fields = get_exam_fields(validated_data)
+
+            if dry_run:
+                answer_data, classification_data, student_answer_data = parse_exam_upload(course, answer_file, classification_file, student_answer_file)
+                answer_matrix = grade_student_answers(exam_fields["chapters"], answer_data, classification_data, student_answer_data)
+                max_score = exam_fields["max_score"] * validated_data["clo_type"].weight / 100
+                question_bank = {
+                    "answer_data": answer_data if answer_file is not None else None,
+                    "classification_data": classification_data if classification_file is not None else None,
+                }
+                preview = create_upload_preview(exam_fields, max_score, student_answer_data, answer_matrix, question_bank)
+                return RestResponse(status=status.HTTP_200_OK, data=preview).response
+
+            if background is None:
+                upload_size = sum(file.size for file in [answer_file, classification_file, student_answer_file] if file is not None)
+                background = upload_size > settings.EXAM_INGESTION_SYNC_MAX_BYTES
+
+            if background:
+                job = create_ingestion_job(exam_fields, answer_file, classification_file, student_answer_file)
+                submit_ingestion_job(job)
+                return RestResponse(status=status.HTTP_202_ACCEPTED, data=ExamIngestionJobSerializer(job).data).response
+
+            answer_data, classification_data, student_answer_data = parse_exam_upload(course, answer_file, classification_file, student_answer_file)
+            answer_matrix = grade_student_answers(exam_fields["chapters"], answer_data, classification_data, student_answer_data)
+            exam = create_exam_with_results(exam_fields, student_answer_data, answer_matrix, {
+                "answer_data": answer_data if answer_file is not None else None,
+                "classification_data": classification_data if classification_file is not None else None,
+            })
 
-            answer_data = self.__load_and_validate_answer_file(course.code, answer_file)
-            classification_data = self.__load_and_validate_classification_file(course.code, classification_file)
-            student_answer_data = self.__load_and_validate_student_answer_file(course.code, student_answer_file)
-
-            self.__validate_exam_result_data(course.code, answer_data, classification_data, student_answer_data)
-            self.__consolidate_exam_result_data(validated_data["chapters"], answer_data, classification_data, student_answer_data)
-
-            with transaction.atomic():
-                exam = Exam.objects.create(
-                    course_class=validated_data['course_class'],
-                    name=validated_data["name"],
-                    description=validated_data["description"],
-                    clo_type=validated_data["clo_type"],
-                    exam_format=validated_data["exam_format"],
-                    chapters=validated_data["chapters"],
-                    pass_expectation_rate=validated_data["pass_expectation_rate"],
-                    clo_pass_threshold=validated_data["clo_pass_threshold"],
-                    max_score=validated_data["max_score"],
-                )
-
-                exam_results = []
-
-                for student_code, student_data in student_answer_data.items():
-                    exam_results.append(
-                        ExamResult(
-                            student_code=student_code,
-                            student_name=student_data["student_name"],
-                            exam=exam,
-                            total_questions=student_data["number_of_questions"],
-                            total_easy_questions=student_data["number_of_easy_questions"],
-                            total_medium_questions=student_data["number_of_medium_questions"],
-                            total_hard_questions=student_data["number_of_correct_hard_questions"],
-                            total_correct_easy_questions=student_data["number_of_correct_easy_questions"],
-                            total_correct_medium_questions=student_data["number_of_correct_medium_questions"],
-                            total_correct_hard_questions=student_data["number_of_correct_hard_questions"],
-                        )
-                    )
-                
-                ExamResult.objects.bulk_create(exam_results)
             return RestResponse(status=status.HTTP_200_OK, data=ExamSerializer(exam).data).response
         except Course.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, data="Không tìm thấy học phần tương ứng!").response
@@ -244,218 +322,204 @@ class ExamView(ViewSet):
             logging.getLogger().error("ExamView.upload_exam_results exc=%s", str(e))
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-    def __consolidate_exam_result_data(self, chapters, answer_data, classification_data, student_answer_data):
-        for _, student_data in student_answer_data.items():
-            student_data["number_of_correct_easy_questions"] = 0
-            student_data["number_of_correct_medium_questions"] = 0
-            student_data["number_of_correct_hard_questions"] = 0
-            student_data["number_of_correct_questions"] = 0
-            student_data["number_of_easy_questions"] = 0
-            student_data["number_of_medium_questions"] = 0
-            student_data["number_of_hard_questions"] = 0
-            student_data["number_of_dropped_questions"] = 0
-
-            for question_code, answer in student_data['answers'].items():
-                chapter_code = question_code[:-4]
-
-                if chapter_code not in classification_data or classification_data[chapter_code] not in chapters:
-                    student_data["number_of_dropped_questions"] += 1
-                    continue
-
-                is_correct = answer == answer_data["questions"][question_code]["correct_answer"]
-                
-                if is_correct:
-                    student_data["number_of_correct_questions"] += 1
-                    
-                if answer_data["questions"][question_code]["difficulty"] == "d":
-                    student_data["number_of_easy_questions"] += 1
-
-                    if is_correct:
-                        student_data["number_of_correct_easy_questions"] += 1
-                elif answer_data["questions"][question_code]["difficulty"] == "t":
-                    student_data["number_of_medium_questions"] += 1
-
-                    if is_correct:
-                        student_data["number_of_correct_medium_questions"] += 1
-                elif answer_data["questions"][question_code]["difficulty"] == "k":
-                    student_data["number_of_hard_questions"] += 1
-
-                    if is_correct:
-                        student_data["number_of_correct_hard_questions"] += 1
-
-        number_of_dropped_questions_set = set()
-
-        for _, student_data in student_answer_data.items():
-            number_of_dropped_questions_set.add(student_data["number_of_dropped_questions"])
-
-        if len(number_of_dropped_questions_set) > 1:
-            raise InvalidFileContentException("Số lượng câu hỏi bị loại trừ của sinh viên không tương đồng!")
-
-    def __validate_exam_result_data(self, course_code, answer_data, classification_data, student_answer_data):
-        # if len(answer_data["questions"]) != len(classification_data):
-        #     raise InvalidFileContentException("Số lượng câu hỏi trong file đáp án và file câu hỏi - chương không khớp!")
-
-        unique_student_question_codes = set()
-
-        for _, student_data in student_answer_data.items():
-            for question_code in student_data['answers'].keys():
-                unique_student_question_codes.add(question_code)
-
-        unknown_question_codes = unique_student_question_codes - set(answer_data["questions"].keys())
-
-        if unknown_question_codes:
-            raise InvalidFileContentException(f"Có các câu hỏi trong file đáp án của sinh viên không tồn tại trong file đáp án: {', '.join(unknown_question_codes)}")
+    @swagger_auto_schema(request_body=CommitExamUploadSerializer)
+    @action(detail=False, methods=['post'], url_path='upload-exam-results/commit')
+    def commit_exam_results(self, request):
+        try:
+            logging.getLogger().info("ExamView.commit_exam_results req=%s", request.data)
+            serializer = CommitExamUploadSerializer(data=request.data)
 
-        number_of_questions_per_student = {}
-        for student_id, student_data in student_answer_data.items():
-            number_of_questions_per_student[student_id] = len(student_data['answers'])
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors).response
 
-        if len(set(number_of_questions_per_student.values())) > 1:
-            submsg = ", ".join([f"{student_id} có {number_of_questions_per_student[student_id]}" for student_id in number_of_questions_per_student.keys()])
-            raise InvalidFileContentException(f"Số lượng câu hỏi trong file đáp án của sinh viên không tương đồng: {submsg}")
+            exam = commit_upload_preview(serializer.validated_data['preview_token'])
 
-    
-    def __load_and_validate_answer_file(self, course_code, file):
-        df = pd.read_excel(file)
-        df = df.map(lambda x: x.lower() if isinstance(x, str) else x)
-        df.columns = df.columns.map(str.lower)
-        df = df.rename(columns={'mã': 'question_code', 'đáp án đúng': 'correct_answer'})
-
-        data = {
-            "questions": {},
-            "exams": {},
-        }
-        duplicate_question_codes = set()
-        course_codes = set()
-        invalid_question_codes = set()
-
-        for _, row in df.iterrows():
-            if row['question_code'] in data:
-                duplicate_question_codes.add(row['question_code'])
-                continue
-
-            _course_code = row['question_code'][:-8].lower()
-
-            if _course_code != course_code.lower():
-                invalid_question_codes.add(row['question_code'])
-
-            course_codes.add(_course_code)
-
-            data["questions"][row['question_code']] = {
-                "correct_answer": row['correct_answer'],
-                "difficulty": row['question_code'][-1].lower(),
-                "no": row['question_code'][-4:-1].lower(),
-                "version": row['question_code'][-8:-4].lower(),
-                "course_code": _course_code,
-            }
-            
-            if row['question_code'][-8:-4].lower() not in data["exams"]:
-                data["exams"][row['question_code'][-8:-4].lower()] = {
-                    "number_of_questions": 1,
-                }
-            else:
-                data["exams"][row['question_code'][-8:-4].lower()]["number_of_questions"] += 1
+            if exam is None:
+                return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Bản xem trước không tồn tại hoặc đã hết hạn!").response
 
-        all_exams_have_same_number_of_questions = all(data["exams"][exam]["number_of_questions"] == data["exams"][list(data["exams"].keys())[0]]["number_of_questions"] for exam in data["exams"])
+            return RestResponse(status=status.HTTP_200_OK, data=ExamSerializer(exam).data).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.commit_exam_results exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-        # if not all_exams_have_same_number_of_questions:
-        #     raise InvalidFileContentException(f"Các mã đề thi có số lượng câu hỏi không tương đồng!")
+    @swagger_auto_schema(request_body=ImportExamBatchSerializer)
+    @action(detail=False, methods=['post'], url_path='import-exam-batch', parser_classes=[MultiPartParser])
+    def import_exam_batch(self, request):
+        try:
+            logging.getLogger().info("ExamView.import_exam_batch req=%s", request.data)
+            serializer = ImportExamBatchSerializer(data=request.data)
 
-        if duplicate_question_codes:
-            raise InvalidFileContentException(f"File đáp án có {len(duplicate_question_codes)} mã câu hỏi bị trùng lặp: {', '.join(duplicate_question_codes)}")
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors).response
 
-        if invalid_question_codes:
-            raise InvalidFileContentException(f"File đáp án có các câu không thuộc môn học {course_code}: {', '.join(invalid_question_codes)}")
-        
-        if len(course_codes) > 1:
-            raise InvalidFileContentException(f"File đáp án có các câu không thuộc cùng 1 môn học: {', '.join(course_codes)}")
-        
-        return data
+            report = import_exam_archive(serializer.validated_data['archive'])
+            return RestResponse(status=status.HTTP_200_OK, data=report).response
+        except InvalidFileContentException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.import_exam_batch exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-    def __load_and_validate_classification_file(self, course_code, file):
-        df = pd.read_excel(file)
-        df = df.map(lambda x: x.lower() if isinstance(x, str) else x)
-        df.columns = df.columns.map(str.lower)
-        df = df.rename(columns={'mã đề': 'exam_version_code', 'chương': 'chapter'})
+    @action(detail=False, methods=['get'], url_path=r'ingestions/(?P<job_id>[0-9]+)')
+    def retrieve_ingestion(self, request, job_id=None):
+        try:
+            logging.getLogger().info("ExamView.retrieve_ingestion job_id=%s", job_id)
+            job = ExamIngestionJob.objects.get(id=job_id)
+            return RestResponse(status=status.HTTP_200_OK, data=ExamIngestionJobSerializer(job).data).response
+        except ExamIngestionJob.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.retrieve_ingestion exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-        data = {}
-        duplicate_exam_version_codes = set()
-        course_codes = set()
-        invalid_exam_version_codes = set()
+    @action(detail=True, methods=['get'], url_path='item-analysis')
+    def item_analysis(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.item_analysis pk=%s", pk)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            answer_matrix = ExamAnswerMatrix.objects.only("id", "updated_at").get(exam=exam)
 
-        for _, row in df.iterrows():
-            if row['exam_version_code'] in data:
-                duplicate_exam_version_codes.add(row['exam_version_code'])
-                continue
+            cache_key = f"exam:{exam.id}:item_analysis:{answer_matrix.updated_at.timestamp()}:{','.join(map(str, sorted(exam.chapters)))}"
+            data = cache.get(cache_key)
 
-            _course_code = row['exam_version_code'][:-4].lower()
+            if data is None:
+                answer_matrix = ExamAnswerMatrix.objects.get(id=answer_matrix.id)
+                data = analyze_items(answer_matrix.to_answer_matrix(), exam.chapters)
+                cache.set(cache_key, data, ITEM_ANALYSIS_CACHE_TIMEOUT)
 
-            if _course_code != course_code.lower():
-                invalid_exam_version_codes.add(_course_code)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except ExamAnswerMatrix.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Bài thi chưa có dữ liệu đáp án chi tiết của sinh viên!").response
+        except Exception as e:
+            logging.getLogger().error("ExamView.item_analysis exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-            course_codes.add(_course_code)
-            data[row['exam_version_code']] = row['chapter']
+    @swagger_auto_schema(
+        responses={200: ExamResultSerializer(many=True)},
+        manual_parameters=[
+            openapi.Parameter(name="cursor", in_="query", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter(name="size", in_="query", type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter(name="sort", in_="query", type=openapi.TYPE_STRING, enum=["score", "-score", "student_code", "-student_code"], required=False),
+            openapi.Parameter(name="letter_grade", in_="query", type=openapi.TYPE_STRING, description="Comma separated, e.g. A,B", required=False),
+            openapi.Parameter(name="is_passed", in_="query", type=openapi.TYPE_BOOLEAN, required=False),
+        ]
+    )
+    @action(detail=True, methods=['get'], url_path='results')
+    def results(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.results pk=%s, params=%s", pk, request.query_params)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            serializer = ExamResultQuerySerializer(data=request.query_params)
 
-        if duplicate_exam_version_codes:
-            raise InvalidFileContentException(f"File câu hỏi - chương có {len(duplicate_exam_version_codes)} mã đề hỏi bị trùng lặp: {', '.join(duplicate_exam_version_codes)}")
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors).response
 
-        if invalid_exam_version_codes:
-            raise InvalidFileContentException(f"File câu hỏi - chương có các mã đề không thuộc môn học {course_code}: {', '.join(invalid_exam_version_codes)}")
-        
-        if len(course_codes) > 1:
-            raise InvalidFileContentException(f"File câu hỏi - chương có các mã đề không thuộc cùng 1 môn học: {', '.join(course_codes)}")
+            query = serializer.validated_data
+            results = ExamResult.objects.filter(exam=exam).with_metrics()
 
-        return data
+            if query.get("letter_grade"):
+                results = results.filter(letter_grade__in=query["letter_grade"])
 
-    def __load_and_validate_student_answer_file(self, course_code, file):
-        df = pd.read_excel(file)
-        df = df.map(lambda x: x.lower() if isinstance(x, str) else x)
-        df.columns = df.columns.map(str.lower)
-        df = df.replace({np.nan: None})
-        df = df.rename(columns={'mssv': 'student_code', 'stt': 'question_number', 'họ tên': 'student_name'})
+            if query["is_passed"] is not None:
+                results = results.filter(is_passed=query["is_passed"])
 
-        duplicate_question_codes = df.columns[df.columns.duplicated()].unique().tolist()
+            descending = query["sort"].startswith("-")
+            ordering = [(RESULT_SORT_FIELDS[query["sort"].lstrip("-")], descending), ("id", descending)]
 
-        if duplicate_question_codes:
-            raise InvalidFileContentException(f"File đáp án của sinh viên có {len(duplicate_question_codes)} mã câu hỏi bị trùng lặp: {', '.join(duplicate_question_codes)}")
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(results, request, ordering)
+            data = ExamResultSerializer(page, many=True).data
 
-        data = {}
-        course_codes = set()
-        student_ids = set()
-        invalid_question_codes = set()
+            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(data)).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except InvalidCursorException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.results exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-        for _, row in df.iterrows():
-            student_id = str(row['student_code']).strip()
-            answers = row.drop(labels=['student_code', 'question_number', 'student_name']).dropna().to_dict()
+    @action(detail=True, methods=['get'], url_path='chapters')
+    def chapters(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.chapters pk=%s", pk)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            return RestResponse(status=status.HTTP_200_OK, data=ExamResultChapter.summary_for_exam(exam)).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.chapters exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-            if student_id in data:
-                student_ids.add(student_id)
+    @action(detail=True, methods=['get'], url_path='versions')
+    def versions(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.versions pk=%s", pk)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            return RestResponse(status=status.HTTP_200_OK, data=version_statistics(exam)).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.versions exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-            version = set()
-            data[student_id] = {}
-            data[student_id]["student_name"] = row['student_name']
-            data[student_id]["answers"] = answers
-            data[student_id]["number_of_questions"] = len(answers)
+    @action(detail=True, methods=['get'], url_path='similarity')
+    def similarity(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.similarity pk=%s", pk)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            report = AnswerSimilarityReport.objects.prefetch_related('pairs').get(exam=exam)
+            return RestResponse(status=status.HTTP_200_OK, data=AnswerSimilarityReportSerializer(report).data).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except AnswerSimilarityReport.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Bài thi chưa được phân tích độ tương đồng đáp án!").response
+        except Exception as e:
+            logging.getLogger().error("ExamView.similarity exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-            for question_code, answer in answers.items():
-                _course_code = question_code[:-8].lower()
+    @swagger_auto_schema(request_body=AnalyzeAnswerSimilaritySerializer)
+    @similarity.mapping.post
+    def analyze_similarity(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.analyze_similarity pk=%s, req=%s", pk, request.data)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            serializer = AnalyzeAnswerSimilaritySerializer(data=request.data)
 
-                if _course_code != course_code.lower():
-                    invalid_question_codes.add(question_code)
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors).response
 
-                course_codes.add(_course_code)
-                version.add(question_code[-8:-4].lower())
+            report = analyze_exam_similarity(exam, **serializer.validated_data)
+            return RestResponse(status=status.HTTP_200_OK, data=AnswerSimilarityReportSerializer(report).data).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except ExamAnswerMatrix.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Bài thi chưa có dữ liệu đáp án chi tiết của sinh viên!").response
+        except Exception as e:
+            logging.getLogger().error("ExamView.analyze_similarity exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
 
-            # if len(version) > 1:
-            #     raise InvalidFileContentException(f"File đáp án của sinh viên {student_id} có các câu không thuộc cùng 1 mã đề thi: {', '.join(version)}")
+    @swagger_auto_schema(request_body=RegradeExamSerializer)
+    @action(detail=True, methods=['post'], url_path='regrade')
+    def regrade(self, request, pk=None):
+        try:
+            logging.getLogger().info("ExamView.regrade pk=%s, req=%s", pk, request.data)
+            exam = Exam.objects.get(id=pk, deleted_at=None)
+            serializer = RegradeExamSerializer(data=request.data)
 
-        if student_ids:
-            raise InvalidFileContentException(f"Có {len(student_ids)} mã sinh viên bị trùng lặp: {student_ids.join(', ')}")
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors).response
 
-        if invalid_question_codes:
-            raise InvalidFileContentException(f"File đáp án của sinh viên có các câu không thuộc môn học {course_code}: {', '.join(invalid_question_codes)}")
-        
-        if len(course_codes) > 1:
-            raise InvalidFileContentException(f"File đáp án của sinh viên có các câu không thuộc cùng 1 môn học: {', '.join(course_codes)}")
- 
-        return data
\ No newline at end of file
+            summary = regrade_exam(exam, **serializer.validated_data)
+            return RestResponse(status=status.HTTP_200_OK, data=summary).response
+        except Exam.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).response
+        except ExamAnswerMatrix.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Bài thi chưa có dữ liệu đáp án chi tiết của sinh viên!").response
+        except InvalidFileContentException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
+        except Exception as e:
+            logging.getLogger().error("ExamView.regrade exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
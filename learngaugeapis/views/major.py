@@ -6,6 +6,7 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 from learngaugeapis.helpers.response import RestResponse
+from learngaugeapis.helpers.response_cache import add_response_tags, cache_response, entity_tag, invalidate_tags
 from learngaugeapis.helpers.paginator import CustomPageNumberPagination
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.middlewares.permissions import IsRoot
@@ -14,7 +15,7 @@ from learngaugeapis.serializers.major import MajorSerializer, CreateMajorSeriali
 
 class MajorView(ViewSet):
     authentication_classes = [UserAuthentication]
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy']:
@@ -50,6 +51,7 @@ class MajorView(ViewSet):
             )
         ]
     )
+    @cache_response("majors")
     def list(self, request):
         try:
             logging.getLogger().info("MajorView.list req=%s", request.query_params)
@@ -63,17 +65,21 @@ class MajorView(ViewSet):
             if name:
                 majors = majors.filter(name__icontains=name)
 
-            majors = self.paginator.paginate_queryset(majors, request)
+            paginator = self.pagination_class()
+            majors = paginator.paginate_queryset(majors, request)
+            add_response_tags(request, *(entity_tag("major", major.id) for major in majors))
             serializer = MajorSerializer(majors, many=True)
-            return RestResponse(status=status.HTTP_200_OK, data=self.paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
         except Exception as e:
             logging.getLogger().exception("MajorView.list exc=%s, req=%s", str(e), request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
         
+    @cache_response("majors")
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("MajorView.retrieve pk=%s", pk)
             major = Major.objects.get(id=pk, deleted_at=None)
+            add_response_tags(request, entity_tag("major", major.id))
             serializer = MajorSerializer(major)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except Major.DoesNotExist:
@@ -97,6 +103,7 @@ class MajorView(ViewSet):
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Mã ngành đào tạo đã được sử dụng!").response
             
             major = Major.objects.create(**validated_data)
+            invalidate_tags("majors")
 
             return RestResponse(status=status.HTTP_201_CREATED, data=MajorSerializer(major).data).response
         except Exception as e:
@@ -122,6 +129,7 @@ class MajorView(ViewSet):
                 setattr(major, key, value)
 
             major.save()
+            invalidate_tags("majors", entity_tag("major", major.id))
 
             return RestResponse(status=status.HTTP_200_OK, data=MajorSerializer(major).data).response
         except Major.DoesNotExist:
@@ -136,6 +144,7 @@ class MajorView(ViewSet):
             major = Major.objects.get(id=pk, deleted_at=None)
             major.deleted_at = datetime.now()
             major.save()
+            invalidate_tags("majors", entity_tag("major", major.id))
             return RestResponse(status=status.HTTP_200_OK).response
         except Major.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND).response
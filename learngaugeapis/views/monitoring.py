@@ -0,0 +1,20 @@
+import logging
+from rest_framework.views import APIView
+from rest_framework import status
+
+from learngaugeapis.helpers.response import RestResponse
+from learngaugeapis.helpers.response_cache import response_cache_stats
+from learngaugeapis.middlewares.authentication import UserAuthentication
+from learngaugeapis.middlewares.permissions import IsRoot
+
+class ResponseCacheStatsView(APIView):
+    authentication_classes = [UserAuthentication]
+    permission_classes = [IsRoot]
+
+    def get(self, request):
+        try:
+            logging.getLogger().info("ResponseCacheStatsView.get")
+            return RestResponse(status=status.HTTP_200_OK, data=response_cache_stats()).response
+        except Exception as e:
+            logging.getLogger().exception("ResponseCacheStatsView.get exc=%s", str(e))
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response
@@ -8,16 +8,17 @@ from drf_yasg import openapi
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 
+from learngaugeapis.errors.exceptions import InvalidCursorException
 from learngaugeapis.helpers.response import RestResponse
 from learngaugeapis.helpers.send_html_email import send_html_template_email
 from learngaugeapis.middlewares.authentication import UserAuthentication
 from learngaugeapis.models.user import User
 from learngaugeapis.serializers.user import ChangePasswordSerializer, UpdateUserSerializer, UserSerializer
-from learngaugeapis.helpers.paginator import CustomPageNumberPagination
+from learngaugeapis.helpers.paginator import CustomPageNumberPagination, get_list_paginator
 
 class UserView(viewsets.ViewSet):
     authentication_classes = (UserAuthentication, )
-    paginator = CustomPageNumberPagination()
+    pagination_class = CustomPageNumberPagination
 
     @swagger_auto_schema(
         responses={200: UserSerializer(many=True)},
@@ -39,6 +40,20 @@ class UserView(viewsets.ViewSet):
                 in_="query",
                 type=openapi.TYPE_INTEGER,
                 required=False
+            ),
+            openapi.Parameter(
+                name="cursor",
+                in_="query",
+                type=openapi.TYPE_STRING,
+                description="Cursor pagination: empty for the first page, then next_cursor",
+                required=False
+            ),
+            openapi.Parameter(
+                name="total",
+                in_="query",
+                type=openapi.TYPE_BOOLEAN,
+                description="Cursor pagination: include the (cached) total",
+                required=False
             )
         ]
     )
@@ -51,10 +66,13 @@ class UserView(viewsets.ViewSet):
             if role:
                 users = users.filter(role=role)
 
-            users = self.paginator.paginate_queryset(users, request)
+            paginator = get_list_paginator(request, self.pagination_class)
+            users = paginator.paginate_queryset(users, request)
 
             serializer = UserSerializer(users, many=True)
-            return RestResponse(status=status.HTTP_200_OK, data=self.paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+        except InvalidCursorException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message=str(e)).response
         except Exception as e:
             logging.getLogger().exception("UserView.list exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).response